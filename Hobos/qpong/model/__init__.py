@@ -20,3 +20,4 @@ Circuit grid model and node types on the grid
 
 from .circuit_grid_model import CircuitGridModel, CircuitGridNode
 from .circuit_node_types import *
+from .measurement_sampler import MeasurementSampler
@@ -0,0 +1,81 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Sampling of measurement outcomes from basis state probabilities
+"""
+
+import numpy as np
+
+
+class MeasurementSampler:
+    """
+    Draws measurement outcomes by searching uniform draws in the cumulative
+    distribution of the probabilities. The distribution is built once per
+    probability vector, so the vector must not be modified afterwards.
+    """
+
+    def __init__(self, rng=None):
+        """
+        Parameters:
+        rng (numpy.random.Generator or integer): generator, or seed of a new
+            generator, so that measurements can be reproduced
+        """
+        self.rng = np.random.default_rng(rng)
+        self._probabilities = None
+        self._cdf = None
+
+    def cdf(self, probabilities):
+        """
+        Get the normalized cumulative distribution of the probabilities,
+        reusing the last one when given the same vector again
+        """
+        if probabilities is not self._probabilities:
+            cdf = np.cumsum(probabilities)
+            cdf /= cdf[-1]
+            self._probabilities = probabilities
+            self._cdf = cdf
+        return self._cdf
+
+    def sample(self, probabilities, shots=None):
+        """
+        Draw measurement outcomes
+
+        Parameters:
+        probabilities (ndarray): probability of each basis state
+        shots (integer): number of outcomes to draw, or None for a single one
+
+        Returns:
+            integer, or ndarray of integers when shots is given
+        """
+        cdf = self.cdf(probabilities)
+        draws = self.rng.random(1 if shots is None else shots)
+        # side="right" never picks a basis state of zero probability
+        outcomes = np.minimum(np.searchsorted(cdf, draws, side="right"), len(cdf) - 1)
+        if shots is None:
+            return int(outcomes[0])
+        return outcomes
+
+    def counts(self, probabilities, shots):
+        """
+        Count the outcomes of many measurements
+
+        Returns:
+            ndarray: number of times each basis state was measured
+        """
+        return np.bincount(
+            self.sample(probabilities, shots), minlength=len(probabilities)
+        )
@@ -22,6 +22,7 @@ import pygame
 
 from qiskit.quantum_info import Statevector
 
+from qpong.model.measurement_sampler import MeasurementSampler
 from qpong.utils.colors import WHITE, BLACK, GRAY
 from qpong.utils.parameters import (
     WIDTH_UNIT,
@@ -42,12 +43,27 @@ from qpong.utils.ball import Ball
 from qpong.utils.font import Font
 
 
+def circuit_key(circuit):
+    """
+    Key of the gates of a circuit, equal for circuits
+    constructed from the same circuit grid
+    """
+    return tuple(
+        (
+            instruction.operation.name,
+            tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+            tuple(instruction.operation.params),
+        )
+        for instruction in circuit.data
+    )
+
+
 class StatevectorGrid(pygame.sprite.Sprite):
     """
     Displays a statevector grid
     """
 
-    def __init__(self, circuit, qubit_num):
+    def __init__(self, circuit, qubit_num, rng=None):
         pygame.sprite.Sprite.__init__(self)
         self.image = None
         self.rect = None
@@ -57,6 +73,9 @@ class StatevectorGrid(pygame.sprite.Sprite):
         self.basis_states = comp_basis_states(circuit.width())
         self.circuit = circuit
         self.question_number = 0
+        self.sampler = MeasurementSampler(rng)
+        self._probabilities_key = None
+        self._probabilities = None
 
         self.selection = pygame.Surface([ANSWER_WIDTH, ANSWER_HEIGHT])
         pygame.draw.rect(self.selection, WHITE, (0, 0, ANSWER_WIDTH, ANSWER_HEIGHT), width=10)
@@ -117,15 +136,15 @@ class StatevectorGrid(pygame.sprite.Sprite):
         """
         self.update()
         self.display_statevector(qubit_num)
-        quantum_state = Statevector(circuit)
+        probabilities = self.probabilities(circuit)
 
         self.image.blit(self.selection, (0, 0))
 
         self.display_questions(self.image)
 
 
-        for basis_state, ampl in enumerate(quantum_state):
-            self.selection.set_alpha(int(round(abs(ampl) ** 2 * 255)))
+        for basis_state, probability in enumerate(probabilities):
+            self.selection.set_alpha(int(round(probability * 255)))
 
 
             x_coord = basis_state // 2
@@ -140,11 +159,18 @@ class StatevectorGrid(pygame.sprite.Sprite):
         """
         Measure all qubits on circuit
         """
-        measurement_bitstring = Statevector(circuit).sample_memory(1)[0]
-        print(measurement_bitstring)
-        measurement_int = int(measurement_bitstring, 2)
+        return self.sampler.sample(self.probabilities(circuit))
 
-        return measurement_int
+    def probabilities(self, circuit):
+        """
+        Get basis state probabilities of circuit, simulating
+        it only when its gates changed since the last call
+        """
+        key = circuit_key(circuit)
+        if key != self._probabilities_key:
+            self._probabilities_key = key
+            self._probabilities = Statevector(circuit).probabilities()
+        return self._probabilities
 
     def update(self):
         """
@@ -0,0 +1,105 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Play batches of headless matches to balance the game difficulty
+"""
+
+import argparse
+
+from qpong.utils.headless import DIFFICULTIES
+from qpong.utils.match_simulator import (
+    STRATEGIES,
+    settings_grid,
+    simulate,
+    write_report,
+)
+from qpong.utils.parameters import (
+    CLASSICAL_REACTION_TIME,
+    CLASSICAL_JITTER,
+    CLASSICAL_PADDLE_SPEED,
+)
+
+
+def main():
+    """
+    Simulate every combination of the settings and write the report
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--difficulty",
+        nargs="+",
+        choices=sorted(DIFFICULTIES),
+        default=list(DIFFICULTIES),
+    )
+    parser.add_argument(
+        "--reaction-time",
+        nargs="+",
+        type=int,
+        default=[CLASSICAL_REACTION_TIME],
+        help="classical paddle reaction times (in milliseconds)",
+    )
+    parser.add_argument(
+        "--jitter",
+        nargs="+",
+        type=float,
+        default=[CLASSICAL_JITTER],
+        help="classical paddle aim jitters (in WIDTH_UNIT)",
+    )
+    parser.add_argument(
+        "--paddle-speed",
+        nargs="+",
+        type=float,
+        default=[CLASSICAL_PADDLE_SPEED],
+        help="classical paddle speeds (in WIDTH_UNIT per tick)",
+    )
+    parser.add_argument(
+        "--strategy",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=list(STRATEGIES),
+        help="quantum player strategies",
+    )
+    parser.add_argument("--matches", type=int, default=100, help="per setting")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, help="default: number of CPUs")
+    parser.add_argument(
+        "--output", default="balance.json", help="report path, .csv or .json"
+    )
+    args = parser.parse_args()
+
+    settings = settings_grid(
+        args.difficulty,
+        args.reaction_time,
+        args.jitter,
+        args.strategy,
+        args.paddle_speed,
+    )
+    rows = simulate(settings, args.matches, args.seed, args.processes)
+    write_report(rows, args.output)
+
+    for row in rows:
+        print(
+            "%(difficulty)-6s %(reaction_time)4d ms jitter %(jitter)4.1f "
+            "speed %(paddle_speed)4.1f "
+            "%(strategy)-8s quantum wins %(quantum_win_rate).2f, "
+            "%(mean_rallies).1f rallies of %(mean_rally_ticks).0f ticks" % row
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Run QPong without a window, to measure and balance the game
+"""
+
+import argparse
+
+import pygame
+
+from qpong.utils.headless import DIFFICULTIES, run_headless
+
+
+def main():
+    """
+    Run headless rallies and print their statistics
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, help="physics ticks to run")
+    parser.add_argument(
+        "--rallies", type=int, help="points to play (default 1000 without --ticks)"
+    )
+    parser.add_argument("--seed", type=int, help="seed for reproducible runs")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="normal")
+    parser.add_argument(
+        "--render", action="store_true", help="draw every tick on a dummy display"
+    )
+    args = parser.parse_args()
+
+    result = run_headless(
+        args.ticks,
+        args.rallies,
+        args.seed,
+        DIFFICULTIES[args.difficulty],
+        args.render,
+    )
+    pygame.quit()
+
+    print(
+        "%d ticks, %d rallies, %d matches in %.2f s"
+        % (result.ticks, result.rallies, result.matches, result.seconds)
+    )
+    print(
+        "classical %d, quantum %d points"
+        % (result.classical_points, result.quantum_points)
+    )
+    print(
+        "%.0f ticks/s, %.0f rallies/s"
+        % (result.ticks / result.seconds, result.rallies / result.seconds)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,24 +19,23 @@
 Quantum version of the classic Pong game
 """
 
-import random
-
 import pygame
 from pygame import DOUBLEBUF, HWSURFACE, FULLSCREEN
 
+from qpong.controls.circuit_grid import rotation_glyphs
+from qpong.model.simulation_worker import SimulationWorker
 from qpong.utils.ball import Ball
 from qpong.utils.input import Input
 from qpong.utils.level import Level
-from qpong.utils.scene import Scene
-from qpong.utils.parameters import (
-    WINDOW_SIZE,
-    CLASSICAL_COMPUTER,
-    QUANTUM_COMPUTER,
-    WIN_SCORE,
-    WIDTH_UNIT,
-    MEASURE_RIGHT,
+from qpong.utils.game_core import GameCore
+from qpong.utils.renderer import (
+    DirtyRectRenderer,
+    draw_static_layers,
+    invalidate_changed_layers,
 )
-from qpong.utils.colors import BLACK
+from qpong.utils.resources import image_cache
+from qpong.utils.scene import Scene
+from qpong.utils.parameters import WINDOW_SIZE
 
 
 def main():
@@ -62,31 +61,31 @@ def main():
 
     pygame.display.set_caption("QPong")
 
-    # clock for timing
+    # load and scale gate and cursor images once, packed into one atlas
+    image_cache.warm_up(atlas=True)
+    rotation_glyphs.warm_up()
+
+    # clock for frame timing, the game physics runs in fixed ticks
     clock = pygame.time.Clock()
-    old_clock = pygame.time.get_ticks()
 
     # initialize scene, level and input Classes
     scene = Scene()
     level = Level()
-    input = Input()
+    simulation_worker = SimulationWorker()
+    renderer = DirtyRectRenderer(
+        screen, lambda surface: draw_static_layers(surface, scene, level, ball)
+    )
+    input = Input(simulation_worker, renderer)
 
     # define ball
     ball = Ball()
-    balls = (
-        pygame.sprite.Group()
-    )  # sprite group type is needed for sprite collide function in pygame
-    balls.add(ball)
 
     # Show start screen to select difficulty
     input.running = scene.start(screen, ball)  # start screen returns running flag
     level.setup(scene, ball)
 
-    # Put all moving sprites a group so that they can be drawn together
-    moving_sprites = pygame.sprite.Group()
-    moving_sprites.add(ball)
-    moving_sprites.add(level.left_paddle)
-    moving_sprites.add(level.right_paddle)
+    # moving sprites are redrawn every frame, over the static layers
+    renderer.add(ball, level.left_paddle, level.right_paddle)
 
     # update the screen
     pygame.display.flip()
@@ -94,83 +93,53 @@ def main():
     # reset the ball
     ball.reset()
 
-    # a valuable to record the time when the paddle is measured
-    measure_time = 100000
+    # game rules, refreshing the paddle a moment after each measurement
+    core = GameCore(
+        scene,
+        level,
+        ball,
+        simulation_worker,
+        lambda: input.update_paddle(level, screen, scene),
+    )
+    timestep = core.timestep
+
+    # the start screen may have taken long, count frame time from here
+    clock.tick()
 
     # Main Loop
     while input.running:
-        # set maximum frame rate
-        clock.tick(60)
-        # refill whole screen with black color at each frame
-        screen.fill(BLACK)
-
-        ball.update()  # update ball position
-        scene.dashed_line(screen, ball)  # draw dashed line in the middle of the screen
-        scene.score(screen, ball)  # print score
-
-        # level.statevector_grid.display_statevector(scene.qubit_num) # generate statevector grid
-        level.right_statevector.draw(
-            screen
-        )  # draw right paddle together with statevector grid
-        level.circuit_grid.draw(screen)  # draw circuit grid
-        moving_sprites.draw(screen)  # draw moving sprites
+        # set maximum frame rate, the physics runs in fixed ticks whatever it is
+        ticks = timestep.advance(clock.tick(60) / 1000)
 
         # Show game over screen if the score reaches WIN_SCORE, reset everything if replay == TRUE
-        if ball.score.get_score(CLASSICAL_COMPUTER) >= WIN_SCORE:
-            scene.gameover(screen, CLASSICAL_COMPUTER)
-            scene.replay(
-                screen, ball.score, level.circuit_grid_model, level.circuit_grid
-            )
-            input.update_paddle(level, screen, scene)
-
-        if ball.score.get_score(QUANTUM_COMPUTER) >= WIN_SCORE:
-            scene.gameover(screen, QUANTUM_COMPUTER)
+        player = core.winner()
+        if player is not None:
+            scene.gameover(screen, player)
             scene.replay(
                 screen, ball.score, level.circuit_grid_model, level.circuit_grid
             )
             input.update_paddle(level, screen, scene)
-
-        # computer paddle movement
-        if pygame.time.get_ticks() - old_clock > 300:
-            level.left_paddle.rect.y = (
-                ball.get_ypos()
-                - level.statevector_grid.block_size / 2
-                + random.randint(-WIDTH_UNIT * 4, WIDTH_UNIT * 4)
-            )
-            old_clock = pygame.time.get_ticks()
+            renderer.invalidate()
+            # the game over screen is not caught up with physics ticks
+            clock.tick()
+            timestep.reset()
 
         # handle input events
         input.handle_input(level, screen, scene)
+        # show the newest simulation finished in the background
+        input.poll_simulation(level, scene)
 
-        # check ball location and decide what to do
-        ball.action()
-
-        if ball.ball_action == MEASURE_RIGHT:
-            circuit = level.circuit_grid_model.construct_circuit()
-            pos = level.statevector_grid.paddle_after_measurement(
-                circuit, scene.qubit_num
-            )
-            level.right_statevector.arrange()
+        for _ in range(ticks):
+            core.tick()
 
-            # paddle after measurement
-            level.right_paddle.rect.y = pos * ball.screenheight / (2**scene.qubit_num)
-            measure_time = pygame.time.get_ticks()
-
-        if pygame.sprite.spritecollide(level.right_paddle, balls, False):
-            ball.bounce_edge()
-
-        if pygame.sprite.spritecollide(level.left_paddle, balls, False):
-            ball.bounce_edge()
-
-        if pygame.time.get_ticks() - measure_time > 400:
-            # refresh the screen a moment after measurement to update visual
-            input.update_paddle(level, screen, scene)
-            # add a buffer time before measure again
-            measure_time = pygame.time.get_ticks() + 100000
+        # draw the ball between its last two physics positions
+        ball.interpolate(timestep.alpha)
 
-        # Update the screen
-        pygame.display.flip()
+        # Update the changed areas of the screen
+        invalidate_changed_layers(renderer, level, ball)
+        renderer.render()
 
+    simulation_worker.shutdown()
     pygame.quit()
 
 
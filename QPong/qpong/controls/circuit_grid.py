@@ -27,7 +27,7 @@ from qpong.model import circuit_node_types as node_types
 from qpong.model.circuit_grid_model import CircuitGridNode
 from qpong.utils.colors import BLACK, WHITE, MAGENTA
 from qpong.utils.navigation import MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
-from qpong.utils.resources import load_image
+from qpong.utils.resources import load_cached_image
 from qpong.utils.parameters import (
     WIDTH_UNIT,
     LINE_WIDTH,
@@ -37,6 +37,85 @@ from qpong.utils.parameters import (
     GATE_TILE_HEIGHT,
 )
 
+ROTATION_IMAGES = {
+    node_types.X: "gate_images/rx_gate.png",
+    node_types.Y: "gate_images/ry_gate.png",
+    node_types.Z: "gate_images/rz_gate.png",
+}
+
+# rotations are changed in steps of pi/8, giving 16 glyphs per gate
+ROTATION_STEP = np.pi / 8
+ROTATION_STEPS = 16
+
+
+def draw_rotation_glyph(image, angle):
+    """
+    Draw the angle of a rotation gate as an arc on a copy of its image
+
+    Parameters:
+    image (pygame.Surface): Rx/Ry/Rz gate image
+    angle (float): angle of rotation (in radians), within [0, 2 pi)
+    """
+    glyph = image.copy()
+    rect = glyph.get_rect()
+    pygame.draw.arc(glyph, MAGENTA, rect, 0, angle, 6)
+    pygame.draw.arc(glyph, MAGENTA, rect, angle, 2 * np.pi, 1)
+    return glyph
+
+
+class RotationGlyphCache:
+    """
+    Rx/Ry/Rz gate images with their angle drawn, keyed by gate type and
+    angle in steps of pi/8. Other angles are drawn without caching.
+    """
+
+    def __init__(self):
+        # (node_type, step) -> (gate image the glyph was drawn from, glyph)
+        self._glyphs = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, node_type, radians):
+        """
+        Get the image of a rotation gate
+
+        Parameters:
+        node_type (integer): X, Y or Z node type
+        radians (float): angle of rotation (in radians)
+
+        Returns:
+            tuple: shared glyph and a new rect of its size
+        """
+        image, _ = load_cached_image(ROTATION_IMAGES[node_type], -1)
+        angle = radians % (2 * np.pi)
+        step = angle / ROTATION_STEP
+        if not np.isclose(step, round(step)):
+            glyph = draw_rotation_glyph(image, angle)
+            return glyph, glyph.get_rect()
+
+        key = (node_type, int(round(step)) % ROTATION_STEPS)
+        cached = self._glyphs.get(key)
+        # glyphs drawn from an image dropped by the image cache are stale
+        if cached is None or cached[0] is not image:
+            self.misses += 1
+            cached = (image, draw_rotation_glyph(image, key[1] * ROTATION_STEP))
+            self._glyphs[key] = cached
+        else:
+            self.hits += 1
+        return cached[1], cached[1].get_rect()
+
+    def warm_up(self):
+        """
+        Draw all glyphs ahead of their first use
+        """
+        for node_type in ROTATION_IMAGES:
+            for step in range(1, ROTATION_STEPS):
+                self.get(node_type, step * ROTATION_STEP)
+
+
+rotation_glyphs = RotationGlyphCache()
+
+
 # pylint: disable=too-few-public-methods
 class CircuitGrid(pygame.sprite.RenderPlain):
     """Enables interaction with circuit"""
@@ -66,7 +145,12 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             self.gate_tiles,
             self.circuit_grid_cursor,
         )
+        # screen areas changed since they were taken with pop_dirty_rects
+        self.dirty_rects = []
+        # (xpos, ypos) the background and tiles were placed for
+        self._layout = None
         self.update()
+        circuit_grid_model.subscribe(self.handle_model_changes)
 
     def update(self):
         """
@@ -77,19 +161,76 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         for sprite in sprite_list:
             sprite.update()
 
+        # updated sprites have new rects, so place them all again
+        self._layout = None
+        self.layout()
+        self.highlight_selected_node(self.selected_wire, self.selected_column)
+
+    def layout(self):
+        """
+        Position the background and gate tiles, unless they are
+        already placed for the current position of the grid
+        """
+        if self._layout == (self.xpos, self.ypos):
+            return
+
         self.circuit_grid_background.rect.left = self.xpos
         self.circuit_grid_background.rect.top = self.ypos
 
         for row_idx in range(self.circuit_grid_model.max_wires):
             for col_idx in range(self.circuit_grid_model.max_columns):
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centerx = self.xpos + GRID_WIDTH * (col_idx + 1.5)
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centery = self.ypos + GRID_HEIGHT * (row_idx + 1.0)
+                self.place_gate_tile(row_idx, col_idx)
 
-        self.highlight_selected_node(self.selected_wire, self.selected_column)
+        self._layout = (self.xpos, self.ypos)
+        self.dirty_rects.append(self.circuit_grid_background.rect.copy())
+
+    def pop_dirty_rects(self):
+        """
+        Take the screen areas changed since the last call
+        """
+        dirty_rects, self.dirty_rects = self.dirty_rects, []
+        return dirty_rects
+
+    def draw_gates(self, surface):
+        """
+        Draw gate tiles and cursor, without the static grid background.
+        Tiles outside the clip area of the surface are skipped.
+        """
+        clip = surface.get_clip()
+        for sprite in self.sprites():
+            if sprite is not self.circuit_grid_background and clip.colliderect(
+                sprite.rect
+            ):
+                surface.blit(sprite.image, sprite.rect)
+
+    def place_gate_tile(self, wire_num, column_num):
+        """
+        Position a gate tile on the grid
+        """
+        gate_tile = self.gate_tiles[wire_num][column_num]
+        gate_tile.rect.centerx = self.xpos + GRID_WIDTH * (column_num + 1.5)
+        gate_tile.rect.centery = self.ypos + GRID_HEIGHT * (wire_num + 1.0)
+
+    def handle_model_changes(self, changes):
+        """
+        Refresh the gate tiles of columns changed in the circuit grid model.
+        The whole column is refreshed, as control and swap tiles depend on
+        the gates on the other wires.
+
+        Parameters:
+        changes (list): NodeChange entries of the mutation
+        """
+        for column_num in sorted({change.column_num for change in changes}):
+            column_tiles = self.gate_tiles[:, column_num]
+            dirty_rect = column_tiles[0].rect.unionall(
+                [gate_tile.rect for gate_tile in column_tiles]
+            )
+            for gate_tile in column_tiles:
+                center = gate_tile.rect.center
+                gate_tile.update()
+                gate_tile.rect.center = center
+                dirty_rect.union_ip(gate_tile.rect)
+            self.dirty_rects.append(dirty_rect)
 
     def highlight_selected_node(self, wire_num, column_num):
         """
@@ -102,6 +243,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         """
         self.selected_wire = wire_num
         self.selected_column = column_num
+        self.dirty_rects.append(self.circuit_grid_cursor.rect.copy())
         self.circuit_grid_cursor.rect.left = (
             self.xpos
             + GRID_WIDTH * (self.selected_column + 1)
@@ -112,6 +254,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             + GRID_HEIGHT * (self.selected_wire + 0.5)
             + round(0.375 * WIDTH_UNIT)
         )
+        self.dirty_rects.append(self.circuit_grid_cursor.rect.copy())
 
     def reset_cursor(self):
         """
@@ -166,7 +309,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             )
         elif selected_node_gate_part == node_types.X:
             self.handle_input_delete()
-        self.update()
 
     def handle_input_y(self):
         """
@@ -180,7 +322,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             )
         elif selected_node_gate_part == node_types.Y:
             self.handle_input_delete()
-        self.update()
 
     def handle_input_z(self):
         """
@@ -194,7 +335,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             )
         elif selected_node_gate_part == node_types.Z:
             self.handle_input_delete()
-        self.update()
 
     def handle_input_h(self):
         """
@@ -208,7 +348,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
             )
         elif selected_node_gate_part == node_types.H:
             self.handle_input_delete()
-        self.update()
 
     def handle_input_delete(self):
         """
@@ -239,8 +378,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                 self.selected_wire, self.selected_column, circuit_grid_node
             )
 
-        self.update()
-
     def handle_input_ctrl(self):
         # pylint: disable=too-many-branches disable=too-many-statements disable=too-many-nested-blocks
         """
@@ -281,7 +418,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                             self.selected_column,
                             CircuitGridNode(node_types.EMPTY),
                         )
-                self.update()
             else:
                 # Attempt to place a control qubit beginning with the wire above
                 if self.selected_wire >= 0:
@@ -365,7 +501,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                                     self.selected_column,
                                     CircuitGridNode(node_types.TRACE),
                                 )
-                        self.update()
                     else:
                         print(
                             "control qubit could not be placed on wire ",
@@ -392,8 +527,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                 self.selected_wire, self.selected_column, circuit_grid_node
             )
 
-        self.update()
-
     def place_ctrl_qubit(self, gate_wire_num, candidate_ctrl_wire_num):
         """
         Attempt to place a control qubit on a wire.
@@ -406,7 +539,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         Returns:
             integer: wire number of control qubit, otherwise -1.
         """
-        if self.circuit_grid_model.max_wires <= candidate_ctrl_wire_num < 0:
+        if not 0 <= candidate_ctrl_wire_num < self.circuit_grid_model.max_wires:
             return -1
         candidate_wire_gate_part = self.circuit_grid_model.get_node_gate_part(
             candidate_ctrl_wire_num, self.selected_column
@@ -424,7 +557,6 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                 self.selected_column,
                 CircuitGridNode(node_types.EMPTY),
             )
-            self.update()
             return candidate_ctrl_wire_num
         print("Can't place control qubit on wire: ", candidate_ctrl_wire_num)
         return -1
@@ -516,91 +648,61 @@ class CircuitGridGate(pygame.sprite.Sprite):
         node = self.circuit_grid_model.get_node(self.wire_num, self.column_num)
 
         if node.node_type == node_types.H:
-            self.image, self.rect = load_image("gate_images/h_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/h_gate.png", -1)
         elif node.node_type == node_types.X:
             if node.ctrl_a >= 0 or node.ctrl_b >= 0:
                 # This is a control-X gate or Toffoli gate
                 if self.wire_num > max(node.ctrl_a, node.ctrl_b):
-                    self.image, self.rect = load_image(
+                    self.image, self.rect = load_cached_image(
                         "gate_images/not_gate_below_ctrl.png", -1
                     )
                 else:
-                    self.image, self.rect = load_image(
+                    self.image, self.rect = load_cached_image(
                         "gate_images/not_gate_above_ctrl.png", -1
                     )
             elif node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rx_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
+                self.image, self.rect = rotation_glyphs.get(
+                    node.node_type, node.radians
                 )
             else:
-                self.image, self.rect = load_image("gate_images/x_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/x_gate.png", -1)
         elif node.node_type == node_types.Y:
             if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/ry_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
+                self.image, self.rect = rotation_glyphs.get(
+                    node.node_type, node.radians
                 )
             else:
-                self.image, self.rect = load_image("gate_images/y_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/y_gate.png", -1)
         elif node.node_type == node_types.Z:
             if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rz_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
+                self.image, self.rect = rotation_glyphs.get(
+                    node.node_type, node.radians
                 )
             else:
-                self.image, self.rect = load_image("gate_images/z_gate.png", -1)
+                self.image, self.rect = load_cached_image("gate_images/z_gate.png", -1)
         elif node.node_type == node_types.S:
-            self.image, self.rect = load_image("gate_images/s_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/s_gate.png", -1)
         elif node.node_type == node_types.SDG:
-            self.image, self.rect = load_image("gate_images/sdg_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/sdg_gate.png", -1)
         elif node.node_type == node_types.T:
-            self.image, self.rect = load_image("gate_images/t_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/t_gate.png", -1)
         elif node.node_type == node_types.TDG:
-            self.image, self.rect = load_image("gate_images/tdg_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/tdg_gate.png", -1)
         elif node.node_type == node_types.CTRL:
             if self.wire_num > self.circuit_grid_model.get_gate_wire_for_control_node(
                 self.wire_num, self.column_num
             ):
-                self.image, self.rect = load_image(
+                self.image, self.rect = load_cached_image(
                     "gate_images/ctrl_gate_bottom_wire.png", -1
                 )
             else:
-                self.image, self.rect = load_image(
+                self.image, self.rect = load_cached_image(
                     "gate_images/ctrl_gate_top_wire.png", -1
                 )
         elif node.node_type == node_types.TRACE:
-            self.image, self.rect = load_image("gate_images/trace_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/trace_gate.png", -1)
         elif node.node_type == node_types.SWAP:
-            self.image, self.rect = load_image("gate_images/swap_gate.png", -1)
+            self.image, self.rect = load_cached_image("gate_images/swap_gate.png", -1)
         else:
             self.image = pygame.Surface([GATE_TILE_WIDTH, GATE_TILE_HEIGHT])
             self.image.set_alpha(0)
@@ -614,7 +716,7 @@ class CircuitGridCursor(pygame.sprite.Sprite):
 
     def __init__(self):
         pygame.sprite.Sprite.__init__(self)
-        self.image, self.rect = load_image(
+        self.image, self.rect = load_cached_image(
             "cursor_images/circuit-grid-cursor-medium.png", -1
         )
         self.image.convert_alpha()
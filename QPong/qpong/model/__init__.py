@@ -20,3 +20,7 @@ Circuit grid model and node types on the grid
 
 from .circuit_grid_model import CircuitGridModel, CircuitGridNode
 from .circuit_node_types import *
+from .statevector_simulator import StatevectorSimulator, QiskitSimulator
+from .stabilizer_simulator import StabilizerSimulator
+from .simulation_cache import SimulationCache
+from .measurement_sampler import MeasurementSampler
@@ -17,11 +17,20 @@
 Grid-based model underlying the circuit grid for the quantum player
 """
 
-import numpy as np
+import hashlib
+from collections import deque, namedtuple
 
-from qiskit import QuantumCircuit, QuantumRegister
+import numpy as np
 
 from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_optimizer import optimize_columns
+from qpong.model.circuit_template import CircuitTemplate
+from qpong.model.simulation_cache import SimulationCache
+from qpong.model.statevector_simulator import (
+    apply_operation,
+    probabilities_from_statevector,
+    zero_state,
+)
 
 NODE_IDENTIFIERS = {
     0: "i",
@@ -37,20 +46,103 @@ NODE_IDENTIFIERS = {
     10: "c",
 }
 
+# One record per grid cell. Each field is a plane of the grid, e.g.
+# nodes["ctrl_a"][:, column_num] are the control wires of a column
+NODE_DTYPE = np.dtype(
+    [
+        ("node_type", np.int8),
+        ("radians", np.float64),
+        ("ctrl_a", np.int16),
+        ("ctrl_b", np.int16),
+        ("swap", np.int16),
+    ]
+)
+
+EMPTY_NODE = np.array((node_types.EMPTY, 0.0, -1, -1, -1), dtype=NODE_DTYPE)
+
+# A mutation of one grid cell, recorded in CircuitGridModel.journal. The old
+# and new nodes are raw rows: tuples of the NODE_DTYPE fields, in that order
+NodeChange = namedtuple(
+    "NodeChange", ["wire_num", "column_num", "old_node", "new_node"]
+)
+
+JOURNAL_LENGTH = 256
+
+
+class ChangeJournal:
+    """
+    Recent mutations of a grid, newest last, with a revision counter
+    and the callbacks notified of each mutation
+    """
+
+    def __init__(self, maxlen=JOURNAL_LENGTH):
+        self.entries = deque(maxlen=maxlen)
+        self.revision = 0
+        self._observers = []
+
+    def subscribe(self, callback):
+        """
+        Register a callback notified after the grid changes
+
+        Parameters:
+        callback (callable): called with the list of NodeChange of each mutation
+        """
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Remove a callback registered with subscribe
+        """
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def record(self, changes):
+        """
+        Journal the changes of a mutation and notify the observers
+        """
+        self.entries.extend(changes)
+        self.revision += 1
+        for callback in list(self._observers):
+            callback(changes)
+
+
 # pylint: disable=too-few-public-methods
 class CircuitGridModel:
     """
     Grid-based model that is built when user interacts with circuit
     """
 
-    def __init__(self, max_wires, max_columns):
+    def __init__(self, max_wires, max_columns, simulation_cache=None):
         self.max_wires = max_wires
         self.max_columns = max_columns
-        self.nodes = np.full(
-            (max_wires, max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
+        self.nodes = np.full((max_wires, max_columns), EMPTY_NODE, dtype=NODE_DTYPE)
+
+        # reverse index of cells used by a gate on another wire of the column:
+        # the wire of that gate, and the role (CTRL or SWAP) the cell plays in it
+        self._owner_wires = np.full((max_wires, max_columns), -1, dtype=np.int16)
+        self._owner_roles = np.full(
+            (max_wires, max_columns), node_types.EMPTY, dtype=np.int8
+        )
+
+        # compiled gate operations of each column, built on first simulation
+        self._template = None
+
+        # statevector after each column, valid for columns below _valid_columns,
+        # or None where gates combined across the column were skipped
+        self._column_states = [None] * max_columns
+        self._valid_columns = 0
+        self._statevector = None
+        self._probabilities = None
+
+        # simulation results of previously seen grids, keyed by fingerprint
+        self.simulation_cache = (
+            simulation_cache if simulation_cache is not None else SimulationCache()
         )
+        self._fingerprint = None
+
+        # actual mutations of the grid, and callbacks notified of them
+        self._changes = ChangeJournal()
 
     def __str__(self):
         retval = ""
@@ -69,13 +161,115 @@ class CircuitGridModel:
         column_num (integer): column number
         circuit_grid_node (CircuitGridNode): node to be assigned
         """
-        self.nodes[wire_num][column_num] = CircuitGridNode(
+        new_values = (
             circuit_grid_node.node_type,
-            circuit_grid_node.radians,
+            # adding 0.0 turns -0.0 into 0.0, so equal grids get equal fingerprints
+            circuit_grid_node.radians + 0.0,
             circuit_grid_node.ctrl_a,
             circuit_grid_node.ctrl_b,
             circuit_grid_node.swap,
         )
+        old_values = self.nodes[wire_num, column_num].item()
+        if old_values == new_values:
+            return
+
+        self._unindex_node(wire_num, column_num)
+        self.nodes[wire_num, column_num] = new_values
+        self._index_node(wire_num, column_num)
+        self._record_changes([NodeChange(wire_num, column_num, old_values, new_values)])
+
+    @property
+    def journal(self):
+        """
+        Recent NodeChange entries of the grid, newest last
+        """
+        return self._changes.entries
+
+    @property
+    def revision(self):
+        """
+        Number of mutations of the grid so far
+        """
+        return self._changes.revision
+
+    def subscribe(self, callback):
+        """
+        Register a callback notified after the grid changes
+
+        Parameters:
+        callback (callable): called with the list of NodeChange of each mutation
+        """
+        self._changes.subscribe(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Remove a callback registered with subscribe
+        """
+        self._changes.unsubscribe(callback)
+
+    def _record_changes(self, changes):
+        """
+        Journal changes, drop caches they affect and notify observers
+        """
+        if not changes:
+            return
+        if self._template is not None:
+            self._template.apply_changes(self.nodes, changes)
+        self.invalidate_from_column(min(change.column_num for change in changes))
+        self._changes.record(changes)
+
+    def _replace_nodes(self, nodes):
+        """
+        Replace all nodes on the grid, journaling the cells that differ
+        """
+        changes = [
+            NodeChange(
+                int(wire_num),
+                int(column_num),
+                self.nodes[wire_num, column_num].item(),
+                nodes[wire_num, column_num].item(),
+            )
+            for wire_num, column_num in np.argwhere(self.nodes != nodes)
+        ]
+        self.nodes[...] = nodes
+        self._rebuild_index()
+        self._record_changes(changes)
+
+    def _index_node(self, wire_num, column_num):
+        """
+        Add the control and swap wires of a node to the reverse index
+        """
+        _, _, ctrl_a, ctrl_b, swap = self.nodes[wire_num, column_num].item()
+        for other_wire, role in (
+            (swap, node_types.SWAP),
+            (ctrl_b, node_types.CTRL),
+            (ctrl_a, node_types.CTRL),
+        ):
+            if 0 <= other_wire < self.max_wires and other_wire != wire_num:
+                self._owner_wires[other_wire, column_num] = wire_num
+                self._owner_roles[other_wire, column_num] = role
+
+    def _unindex_node(self, wire_num, column_num):
+        """
+        Remove the control and swap wires of a node from the reverse index
+        """
+        owned = self._owner_wires[:, column_num] == wire_num
+        self._owner_wires[owned, column_num] = -1
+        self._owner_roles[owned, column_num] = node_types.EMPTY
+
+    def _rebuild_index(self):
+        """
+        Rebuild the reverse index after replacing all nodes
+        """
+        self._owner_wires[...] = -1
+        self._owner_roles[...] = node_types.EMPTY
+        wires, columns = np.nonzero(
+            (self.nodes["ctrl_a"] != -1)
+            | (self.nodes["ctrl_b"] != -1)
+            | (self.nodes["swap"] != -1)
+        )
+        for wire_num, column_num in zip(wires, columns):
+            self._index_node(wire_num, column_num)
 
     def get_node(self, wire_num, column_num):
         """
@@ -87,10 +281,15 @@ class CircuitGridModel:
         column_num (integer): column number
 
         Returns:
+            CircuitGridNode: a copy of the node, changes to it
+            only take effect through set_node
         """
 
         if wire_num < self.max_wires and column_num < self.max_columns:
-            return self.nodes[wire_num][column_num]
+            node_type, radians, ctrl_a, ctrl_b, swap = self.nodes[
+                wire_num, column_num
+            ].item()
+            return CircuitGridNode(node_type, radians, ctrl_a, ctrl_b, swap)
 
         return None
 
@@ -103,20 +302,14 @@ class CircuitGridModel:
         wire_num (integer): wire number
         column_num (integer): column number
         """
-        requested_node = self.get_node(wire_num, column_num)
-        if requested_node and requested_node.node_type != node_types.EMPTY:
-            # Node is occupied so return its gate
-            return requested_node.node_type
-
-        # Check for control nodes from gates in other nodes in this column
-        nodes_in_column = self.nodes[:, column_num]
-        for idx in range(self.max_wires):
-            if idx != wire_num:
-                other_node = nodes_in_column[idx]
-                if wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    return node_types.CTRL
-                if other_node.swap == wire_num:
-                    return node_types.SWAP
+        if 0 <= wire_num < self.max_wires and 0 <= column_num < self.max_columns:
+            node_type = int(self.nodes["node_type"][wire_num, column_num])
+            if node_type != node_types.EMPTY:
+                # Node is occupied so return its gate
+                return node_type
+
+            # Otherwise the node may be part of a gate on another wire
+            return int(self._owner_roles[wire_num, column_num])
 
         return node_types.EMPTY
 
@@ -128,32 +321,25 @@ class CircuitGridModel:
         control_wire_num (integer): wire number of control qubit
         column_num (integer): column number
         """
-        gate_wire_num = -1
-        nodes_in_column = self.nodes[:, column_num]
-        for wire_idx in range(self.max_wires):
-            if wire_idx != control_wire_num:
-                other_node = nodes_in_column[wire_idx]
-                if control_wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    gate_wire_num = wire_idx
-                    print(
-                        "Found gate: ",
-                        self.get_node_gate_part(gate_wire_num, column_num),
-                        " on wire: ",
-                        gate_wire_num,
-                    )
-        return gate_wire_num
+        if self._owner_roles[control_wire_num, column_num] == node_types.CTRL:
+            return int(self._owner_wires[control_wire_num, column_num])
+        return -1
 
     def construct_circuit(self):
         """
-        Construct quantum circuit with instruction on circuit grid
+        Construct quantum circuit with instruction on circuit grid.
+        qiskit is only needed here, the game itself is simulated with
+        qpong.model.statevector_simulator
         """
+        # pylint: disable=import-outside-toplevel
+        from qiskit import QuantumCircuit, QuantumRegister
+
         register = QuantumRegister(self.max_wires, "q")
         circuit = QuantumCircuit(register)
 
         for column_num in range(self.max_columns):
             for wire_num in range(self.max_wires):
-                print(column_num, wire_num)
-                node = self.nodes[wire_num][column_num]
+                node = self.get_node(wire_num, column_num)
                 attr = []
                 args = []
 
@@ -189,13 +375,132 @@ class CircuitGridModel:
 
     def reset_circuit(self):
         """
-        Reset circuit by reinitializing nodes matrix
+        Reset circuit by clearing nodes matrix
+        """
+        self._replace_nodes(np.full_like(self.nodes, EMPTY_NODE))
+
+    def copy_nodes(self):
+        """
+        Get a copy of all nodes on the grid, as a structured array of NODE_DTYPE
+        """
+        return self.nodes.copy()
+
+    def load_nodes(self, nodes):
+        """
+        Replace all nodes on the grid with a copy made by copy_nodes
+
+        Parameters:
+        nodes (ndarray): structured array of NODE_DTYPE with the grid shape
+        """
+        self._replace_nodes(nodes)
+
+    def invalidate_from_column(self, column_num):
+        """
+        Drop cached statevectors from a column onward, the state
+        before that column is kept
+
+        Parameters:
+        column_num (integer): first column that changed
+        """
+        self._valid_columns = min(self._valid_columns, column_num)
+        self._statevector = None
+        self._probabilities = None
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """
+        Get a digest of the node types, angles, controls and swaps on the grid.
+        Grids with the same content have the same fingerprint.
+
+        Returns:
+            bytes: 16 byte digest
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.array(self.nodes.shape, dtype=np.int32).tobytes())
+            digest.update(self.nodes.tobytes())
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def get_template(self):
         """
-        self.nodes = np.full(
-            (self.max_wires, self.max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
+        Get the compiled gate operations of the grid. Angle changes of X/Y/Z
+        gates are rebound on the template, other changes recompile their column.
+
+        Returns:
+            CircuitTemplate: template kept in sync with the grid
+        """
+        if self._template is None:
+            self._template = CircuitTemplate(self.nodes)
+        return self._template
+
+    def get_column_state(self, column_num):
+        """
+        Get the statevector after a column, only simulating
+        the columns changed since the previous call
+
+        Parameters:
+        column_num (integer): column number
+
+        Returns:
+            ndarray: flat statevector, shared with the cache so it must not be modified
+        """
+        # resume from the last state kept below the columns to simulate
+        start = min(self._valid_columns, column_num + 1)
+        while start > 0 and self._column_states[start - 1] is None:
+            start -= 1
+        if start > column_num:
+            return self._column_states[column_num].reshape(-1)
+        state = (
+            self._column_states[start - 1] if start > 0 else zero_state(self.max_wires)
+        )
+
+        # gates cancelled or merged across columns are skipped, the states
+        # between them are then not kept
+        template = self.get_template()
+        column_operations, inexact, _ = optimize_columns(
+            [
+                template.column_operations(column)
+                for column in range(start, column_num + 1)
+            ]
         )
+        for offset, operations in enumerate(column_operations):
+            if operations:
+                state = state.copy()
+                for operation in operations:
+                    apply_operation(state, self.max_wires, operation)
+            self._column_states[start + offset] = None if offset in inexact else state
+        self._valid_columns = max(self._valid_columns, column_num + 1)
+
+        return self._column_states[column_num].reshape(-1)
+
+    def get_statevector(self):
+        """
+        Get the statevector of the circuit after the last column,
+        reusing the result of an earlier grid with the same fingerprint
+
+        Returns:
+            ndarray: flat statevector, shared with the cache so it must not be modified
+        """
+        if self._statevector is None:
+            fingerprint = self.fingerprint()
+            result = self.simulation_cache.get(fingerprint)
+            if result is None:
+                statevector = self.get_column_state(self.max_columns - 1)
+                result = (statevector, probabilities_from_statevector(statevector))
+                self.simulation_cache.put(fingerprint, result)
+            self._statevector, self._probabilities = result
+        return self._statevector
+
+    def get_probabilities(self):
+        """
+        Get basis state probabilities of the circuit
+
+        Returns:
+            ndarray: probabilities, shared with the cache so they must not be modified
+        """
+        self.get_statevector()
+        return self._probabilities
 
 
 class CircuitGridNode:
@@ -203,6 +508,8 @@ class CircuitGridNode:
     Represents a node in the circuit grid
     """
 
+    __slots__ = ("node_type", "radians", "ctrl_a", "ctrl_b", "swap")
+
     def __init__(self, node_type, radians=0.0, ctrl_a=-1, ctrl_b=-1, swap=-1):
         self.node_type = node_type
         self.radians = radians
@@ -210,6 +517,19 @@ class CircuitGridNode:
         self.ctrl_b = ctrl_b
         self.swap = swap
 
+    def __eq__(self, other):
+        if not isinstance(other, CircuitGridNode):
+            return NotImplemented
+        return (
+            self.node_type,
+            self.radians,
+            self.ctrl_a,
+            self.ctrl_b,
+            self.swap,
+        ) == (other.node_type, other.radians, other.ctrl_a, other.ctrl_b, other.swap)
+
+    __hash__ = None
+
     def __str__(self):
         string = "type: " + str(self.node_type)
         string += ", radians: " + str(self.radians) if self.radians != 0 else ""
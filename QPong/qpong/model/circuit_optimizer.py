@@ -0,0 +1,210 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Peephole optimization of the gate operations on the circuit grid
+"""
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+
+# Pairs of gates whose product is the identity
+INVERSE_PAIRS = {
+    (node_types.X, node_types.X),
+    (node_types.Y, node_types.Y),
+    (node_types.Z, node_types.Z),
+    (node_types.H, node_types.H),
+    (node_types.S, node_types.SDG),
+    (node_types.SDG, node_types.S),
+    (node_types.T, node_types.TDG),
+    (node_types.TDG, node_types.T),
+    (node_types.SWAP, node_types.SWAP),
+}
+
+ROTATION_GATES = (node_types.X, node_types.Y, node_types.Z)
+
+# Rx/Ry/Rz have a period of 4 pi, 2 pi only flips the sign
+ROTATION_PERIOD = 4 * np.pi
+
+
+def _is_rotation(operation):
+    """
+    Check if an operation is an Rx/Ry/Rz rotation
+    """
+    return operation.node_type in ROTATION_GATES and operation.radians != 0
+
+
+def _wires(operation):
+    """
+    Get the wires an operation acts on
+    """
+    wires = {operation.wire, *operation.controls}
+    if operation.node_type == node_types.SWAP:
+        wires.add(operation.swap)
+    return frozenset(wires)
+
+
+def _same_placement(operation, other):
+    """
+    Check that two operations act on the same target, swap and control wires
+    """
+    if operation.node_type == node_types.SWAP:
+        return (
+            other.node_type == node_types.SWAP
+            and {operation.wire, operation.swap} == {other.wire, other.swap}
+            and set(operation.controls) == set(other.controls)
+        )
+    return operation.wire == other.wire and set(operation.controls) == set(
+        other.controls
+    )
+
+
+def _combine(previous, operation):
+    """
+    Combine two adjacent operations on the same wires
+
+    Returns:
+        tuple: (combined operations replacing both, number of gates eliminated),
+        or None if they cannot be combined
+    """
+    combined = None
+    if not _same_placement(previous, operation):
+        pass
+    elif _is_rotation(previous) and _is_rotation(operation):
+        if previous.node_type == operation.node_type:
+            radians = (previous.radians + operation.radians) % ROTATION_PERIOD
+            if np.isclose(radians, 0) or np.isclose(radians, ROTATION_PERIOD):
+                combined = [], 2
+            else:
+                combined = [previous._replace(radians=radians)], 1
+    elif _is_rotation(previous) or _is_rotation(operation):
+        pass
+    elif (previous.node_type, operation.node_type) in INVERSE_PAIRS:
+        combined = [], 2
+    return combined
+
+
+def _previous_operation(result, wire_history, wires):
+    """
+    Index in result of the operation last acting on all the given wires, and
+    only on them, or None if there is no such operation
+    """
+    last_indices = {
+        wire_history[wire][-1] if wire_history.get(wire) else None for wire in wires
+    }
+    if len(last_indices) != 1 or None in last_indices:
+        return None
+    previous_index = last_indices.pop()
+    if _wires(result[previous_index]) != wires:
+        return None
+    return previous_index
+
+
+def _optimize(operations, columns):
+    """
+    Peephole pass over operations tagged with the column they come from
+
+    Returns:
+        tuple: (reduced list of GateOperation, column of each of them,
+        number of gates eliminated, (first, last) columns of each combination)
+    """
+    result = []
+    result_columns = []
+    # indices in result of the operations acting on each wire, in order
+    wire_history = {}
+    eliminated = 0
+    spans = []
+
+    for operation, column in zip(operations, columns):
+        wires = _wires(operation)
+
+        # combine with the previous operation if it is the last one on all wires
+        previous_index = _previous_operation(result, wire_history, wires)
+        combined = None
+        if previous_index is not None:
+            combined = _combine(result[previous_index], operation)
+
+        if combined is not None:
+            replacement = combined[0]
+            eliminated += combined[1]
+            spans.append((result_columns[previous_index], column))
+            result[previous_index] = replacement[0] if replacement else None
+            if not replacement:
+                for wire in wires:
+                    wire_history[wire].pop()
+        else:
+            for wire in wires:
+                wire_history.setdefault(wire, []).append(len(result))
+            result.append(operation)
+            result_columns.append(column)
+
+    kept = [
+        (operation, column)
+        for operation, column in zip(result, result_columns)
+        if operation is not None
+    ]
+    return (
+        [operation for operation, _ in kept],
+        [column for _, column in kept],
+        eliminated,
+        spans,
+    )
+
+
+def optimize_operations(operations):
+    """
+    Cancel adjacent inverse gates (X.X, H.H, S.SDG, ...) and merge adjacent
+    rotations about the same axis. Two operations are adjacent when nothing
+    acts on any of their wires in between.
+
+    Parameters:
+    operations (list): GateOperation entries in circuit order
+
+    Returns:
+        tuple: (reduced list of GateOperation, number of gates eliminated)
+    """
+    optimized, _, eliminated, _ = _optimize(operations, [0] * len(operations))
+    return optimized, eliminated
+
+
+def optimize_columns(column_operations):
+    """
+    Optimize the operations of consecutive columns together, keeping
+    track of the columns after which the optimized circuit does not
+    give the same state, because gates combined across them
+
+    Parameters:
+    column_operations (list): list of GateOperation entries of each column
+
+    Returns:
+        tuple: (list of optimized GateOperation entries of each column,
+        set of the indices of the columns whose state is not kept,
+        number of gates eliminated)
+    """
+    operations = []
+    columns = []
+    for column, column_ops in enumerate(column_operations):
+        operations.extend(column_ops)
+        columns.extend([column] * len(column_ops))
+
+    optimized, optimized_columns, eliminated, spans = _optimize(operations, columns)
+
+    optimized_operations = [[] for _ in column_operations]
+    for operation, column in zip(optimized, optimized_columns):
+        optimized_operations[column].append(operation)
+    inexact = {column for first, last in spans for column in range(first, last)}
+    return optimized_operations, inexact, eliminated
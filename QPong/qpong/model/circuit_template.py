@@ -0,0 +1,117 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compiled gate operations of the circuit grid with rebindable rotation angles
+"""
+
+from qpong.model.circuit_optimizer import ROTATION_GATES
+from qpong.model.statevector_simulator import nodes_operations
+
+
+def is_rotation_change(old_node, new_node):
+    """
+    Check if two nodes only differ in the angle of an X/Y/Z gate
+
+    Parameters:
+    old_node (tuple): raw row of the node before the change, see NodeChange
+    new_node (tuple): raw row of the node after the change
+    """
+    old_type, _, old_ctrl_a, old_ctrl_b, old_swap = old_node
+    new_type, _, new_ctrl_a, new_ctrl_b, new_swap = new_node
+    return (
+        new_type in ROTATION_GATES
+        and old_type == new_type
+        and old_ctrl_a == new_ctrl_a
+        and old_ctrl_b == new_ctrl_b
+        and old_swap == new_swap == -1
+    )
+
+
+class CircuitTemplate:
+    """
+    Gate operations of each column of the grid, where the angle of every
+    X/Y/Z gate is a parameter that can be rebound without recompiling
+    """
+
+    def __init__(self, nodes):
+        self.max_columns = nodes.shape[1]
+        self._columns = [None] * self.max_columns
+        # (wire_num, column_num) -> index of the operation in its column
+        self._parameters = {}
+        self.compilations = 0
+        self.rebinds = 0
+        for column_num in range(self.max_columns):
+            self.compile_column(nodes, column_num)
+
+    def compile_column(self, nodes, column_num):
+        """
+        Convert the nodes of a column into gate operations
+
+        Parameters:
+        nodes (ndarray): structured array of NODE_DTYPE of the whole grid
+        column_num (integer): column to compile
+        """
+        operations = nodes_operations(nodes[:, column_num])
+        self._columns[column_num] = operations
+        for key in [key for key in self._parameters if key[1] == column_num]:
+            del self._parameters[key]
+        for index, operation in enumerate(operations):
+            if operation.node_type in ROTATION_GATES:
+                self._parameters[(operation.wire, column_num)] = index
+        self.compilations += 1
+
+    def rebind(self, wire_num, column_num, radians):
+        """
+        Change the angle of an X/Y/Z gate, a zero angle
+        gives the plain Pauli gate
+
+        Returns:
+            boolean: False if there is no X/Y/Z gate on the node
+        """
+        index = self._parameters.get((wire_num, column_num))
+        if index is None:
+            return False
+        operations = self._columns[column_num]
+        operations[index] = operations[index]._replace(radians=radians)
+        self.rebinds += 1
+        return True
+
+    def column_operations(self, column_num):
+        """
+        Get gate operations of a column, in wire order
+        """
+        return self._columns[column_num]
+
+    def apply_changes(self, nodes, changes):
+        """
+        Update the template after grid mutations, rebinding angles
+        of rotation-only changes and recompiling other columns
+
+        Parameters:
+        nodes (ndarray): structured array of NODE_DTYPE after the changes
+        changes (list): NodeChange entries of the mutation
+        """
+        recompiled = set()
+        for change in changes:
+            if change.column_num in recompiled:
+                continue
+            if is_rotation_change(change.old_node, change.new_node) and self.rebind(
+                change.wire_num, change.column_num, change.new_node[1]
+            ):
+                continue
+            self.compile_column(nodes, change.column_num)
+            recompiled.add(change.column_num)
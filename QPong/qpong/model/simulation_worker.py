@@ -0,0 +1,156 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Simulation of circuit grid snapshots off the main thread
+"""
+
+from collections import namedtuple
+from concurrent import futures
+import threading
+
+from qpong.model.circuit_grid_model import CircuitGridModel
+
+# Completed simulation of the grid at a model revision
+SimulationResult = namedtuple(
+    "SimulationResult", ["revision", "fingerprint", "statevector", "probabilities"]
+)
+
+_Job = namedtuple("_Job", ["revision", "fingerprint", "future", "cache"])
+
+
+class SimulationWorker:
+    """
+    Simulates snapshots of a circuit grid model on an executor and keeps the
+    result of the newest revision. Jobs superseded by a newer edit are
+    cancelled if they have not started, or discarded when they finish.
+    Grids found in the simulation cache of the model are published at
+    once, and every finished simulation is stored in that cache.
+    """
+
+    def __init__(self, executor=None):
+        """
+        Parameters:
+        executor (concurrent.futures.Executor): executor running simulations,
+            a single background thread by default
+        """
+        self._owns_executor = executor is None
+        self.executor = (
+            executor
+            if executor is not None
+            else futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="simulation"
+            )
+        )
+        self._jobs = []
+        self.latest = None
+        self.discarded = 0
+        # model the snapshots are loaded into, so that simulations reuse its
+        # column states and compiled template, guarded against parallel jobs
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def submit(self, circuit_grid_model):
+        """
+        Queue a simulation of the current grid, unless its revision is
+        already queued or simulated, or its result is in the simulation cache
+
+        Returns:
+            SimulationResult: result published from the cache, or None
+        """
+        revision = circuit_grid_model.revision
+        if self._jobs and self._jobs[-1].revision == revision:
+            return None
+        if self.latest is not None and self.latest.revision == revision:
+            return None
+
+        for job in self._jobs:
+            if job.future.cancel():
+                self.discarded += 1
+        self._jobs = [job for job in self._jobs if not job.future.cancelled()]
+
+        fingerprint = circuit_grid_model.fingerprint()
+        cache = circuit_grid_model.simulation_cache
+        cached = cache.get(fingerprint)
+        if cached is not None:
+            self.latest = SimulationResult(revision, fingerprint, *cached)
+            return self.latest
+
+        future = self.executor.submit(self.simulate, circuit_grid_model.copy_nodes())
+        self._jobs.append(_Job(revision, fingerprint, future, cache))
+        return None
+
+    def simulate(self, nodes):
+        """
+        Simulate a snapshot of the grid made by CircuitGridModel.copy_nodes,
+        starting from the column states of the previous snapshot
+
+        Returns:
+            tuple: (flat statevector, basis state probabilities)
+        """
+        with self._model_lock:
+            if self._model is None or self._model.nodes.shape != nodes.shape:
+                self._model = CircuitGridModel(*nodes.shape)
+            self._model.load_nodes(nodes)
+            return self._model.get_statevector(), self._model.get_probabilities()
+
+    def busy(self):
+        """
+        Check if simulations are queued or running
+        """
+        return bool(self._jobs)
+
+    def poll(self):
+        """
+        Collect finished jobs without blocking
+
+        Returns:
+            SimulationResult: result newer than any collected before, or None
+        """
+        newest = None
+        pending = []
+        for job in self._jobs:
+            if not job.future.done():
+                pending.append(job)
+                continue
+            statevector, probabilities = job.future.result()
+            # stale results are still right for their grid
+            job.cache.put(job.fingerprint, (statevector, probabilities))
+            if self.latest is not None and job.revision <= self.latest.revision:
+                self.discarded += 1
+                continue
+            self.latest = newest = SimulationResult(
+                job.revision, job.fingerprint, statevector, probabilities
+            )
+        self._jobs = pending
+        return newest
+
+    def wait(self, timeout=None):
+        """
+        Block until queued jobs finish, then collect them like poll
+        """
+        futures.wait([job.future for job in self._jobs], timeout=timeout)
+        return self.poll()
+
+    def shutdown(self):
+        """
+        Cancel queued jobs and stop the executor if the worker created it
+        """
+        for job in self._jobs:
+            job.future.cancel()
+        self._jobs = []
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
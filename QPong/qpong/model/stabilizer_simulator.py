@@ -0,0 +1,308 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Stabilizer tableau simulation of Clifford-only circuit grids
+"""
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.measurement_sampler import MeasurementSampler
+from qpong.model.statevector_simulator import grid_operations
+
+# Largest grid measured from the dense statevector, larger
+# Clifford-only grids are measured on a stabilizer tableau
+DENSE_QUBIT_LIMIT = 10
+
+SINGLE_QUBIT_CLIFFORD_GATES = (
+    node_types.X,
+    node_types.Y,
+    node_types.Z,
+    node_types.H,
+    node_types.S,
+    node_types.SDG,
+)
+
+CONTROLLED_CLIFFORD_GATES = (node_types.X, node_types.Y, node_types.Z)
+
+
+def is_clifford_operation(operation):
+    """
+    Check if a gate operation is a Clifford gate the tableau can apply
+    """
+    if operation.node_type == node_types.SWAP:
+        return not operation.controls
+    if operation.radians != 0:
+        return False
+    if not operation.controls:
+        return operation.node_type in SINGLE_QUBIT_CLIFFORD_GATES
+    return (
+        len(operation.controls) == 1
+        and operation.node_type in CONTROLLED_CLIFFORD_GATES
+    )
+
+
+def is_clifford(operations):
+    """
+    Check if all gate operations are Clifford gates
+    """
+    return all(is_clifford_operation(operation) for operation in operations)
+
+
+def _phase_exponents(x_1, z_1, x_2, z_2):
+    """
+    Exponent of i picked up when multiplying Pauli (x_1, z_1) into (x_2, z_2),
+    for arrays of bits
+    """
+    x_1 = x_1.astype(np.int8)
+    z_1 = z_1.astype(np.int8)
+    x_2 = x_2.astype(np.int8)
+    z_2 = z_2.astype(np.int8)
+    return (
+        x_1 * z_1 * (z_2 - x_2)
+        + x_1 * (1 - z_1) * z_2 * (2 * x_2 - 1)
+        + (1 - x_1) * z_1 * x_2 * (1 - 2 * z_2)
+    )
+
+
+class StabilizerTableau:
+    """
+    Aaronson-Gottesman tableau: rows 0..n-1 are destabilizers,
+    rows n..2n-1 stabilizers of the state, starting from |0...0>.
+    Each row is a Pauli product, with X and Z bits per qubit and a sign bit.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.x_bits = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.z_bits = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.signs = np.zeros(2 * num_qubits, dtype=bool)
+        diagonal = np.arange(num_qubits)
+        self.x_bits[diagonal, diagonal] = True
+        self.z_bits[diagonal + num_qubits, diagonal] = True
+
+    def copy(self):
+        """
+        Get an independent copy of the tableau
+        """
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = self.num_qubits
+        tableau.x_bits = self.x_bits.copy()
+        tableau.z_bits = self.z_bits.copy()
+        tableau.signs = self.signs.copy()
+        return tableau
+
+    def hadamard(self, qubit):
+        """
+        Apply a Hadamard gate
+        """
+        self.signs ^= self.x_bits[:, qubit] & self.z_bits[:, qubit]
+        self.x_bits[:, qubit], self.z_bits[:, qubit] = (
+            self.z_bits[:, qubit].copy(),
+            self.x_bits[:, qubit].copy(),
+        )
+
+    def phase(self, qubit):
+        """
+        Apply an S gate
+        """
+        self.signs ^= self.x_bits[:, qubit] & self.z_bits[:, qubit]
+        self.z_bits[:, qubit] ^= self.x_bits[:, qubit]
+
+    def cnot(self, control, target):
+        """
+        Apply a controlled X gate
+        """
+        self.signs ^= (
+            self.x_bits[:, control]
+            & self.z_bits[:, target]
+            & ~(self.x_bits[:, target] ^ self.z_bits[:, control])
+        )
+        self.x_bits[:, target] ^= self.x_bits[:, control]
+        self.z_bits[:, control] ^= self.z_bits[:, target]
+
+    def apply(self, operation):
+        """
+        Apply a Clifford gate operation, up to a global phase
+        """
+        wire = operation.wire
+        node_type = operation.node_type
+
+        if node_type == node_types.SWAP:
+            self.cnot(wire, operation.swap)
+            self.cnot(operation.swap, wire)
+            self.cnot(wire, operation.swap)
+        elif operation.controls:
+            control = operation.controls[0]
+            if node_type == node_types.X:
+                self.cnot(control, wire)
+            elif node_type == node_types.Z:
+                self.hadamard(wire)
+                self.cnot(control, wire)
+                self.hadamard(wire)
+            else:
+                # CY = (I x S) CX (I x SDG)
+                for _ in range(3):
+                    self.phase(wire)
+                self.cnot(control, wire)
+                self.phase(wire)
+        elif node_type == node_types.H:
+            self.hadamard(wire)
+        elif node_type in (node_types.S, node_types.SDG, node_types.Z):
+            repetitions = {node_types.S: 1, node_types.Z: 2, node_types.SDG: 3}
+            for _ in range(repetitions[node_type]):
+                self.phase(wire)
+        else:
+            # X = H Z H, Y = X Z up to a global phase
+            if node_type == node_types.Y:
+                self.phase(wire)
+                self.phase(wire)
+            self.hadamard(wire)
+            self.phase(wire)
+            self.phase(wire)
+            self.hadamard(wire)
+
+    def _rowsum(self, targets, source_x, source_z, source_r):
+        """
+        Multiply the Pauli (source_x, source_z, source_r) into the target rows
+        """
+        exponents = 2 * self.signs[targets].astype(np.int64) + 2 * int(source_r)
+        exponents += _phase_exponents(
+            source_x, source_z, self.x_bits[targets], self.z_bits[targets]
+        ).sum(axis=-1)
+        self.signs[targets] = (exponents % 4) == 2
+        self.x_bits[targets] ^= source_x
+        self.z_bits[targets] ^= source_z
+
+    def measure(self, qubit, rng):
+        """
+        Measure a qubit in the computational basis, collapsing the state
+
+        Parameters:
+        qubit (integer): qubit to measure
+        rng (numpy.random.Generator): source of random outcomes
+
+        Returns:
+            integer: 0 or 1
+        """
+        num_qubits = self.num_qubits
+        anticommuting = np.flatnonzero(self.x_bits[num_qubits:, qubit])
+
+        if anticommuting.size > 0:
+            # random outcome
+            pivot = num_qubits + anticommuting[0]
+            rows = np.flatnonzero(self.x_bits[:, qubit])
+            rows = rows[rows != pivot]
+            self._rowsum(
+                rows,
+                self.x_bits[pivot].copy(),
+                self.z_bits[pivot].copy(),
+                self.signs[pivot],
+            )
+            self.x_bits[pivot - num_qubits] = self.x_bits[pivot]
+            self.z_bits[pivot - num_qubits] = self.z_bits[pivot]
+            self.signs[pivot - num_qubits] = self.signs[pivot]
+            self.x_bits[pivot] = False
+            self.z_bits[pivot] = False
+            self.z_bits[pivot, qubit] = True
+            self.signs[pivot] = bool(rng.integers(2))
+            return int(self.signs[pivot])
+
+        # deterministic outcome, accumulate the stabilizers fixing the qubit
+        scratch_x = np.zeros(num_qubits, dtype=bool)
+        scratch_z = np.zeros(num_qubits, dtype=bool)
+        scratch_r = 0
+        for row in np.flatnonzero(self.x_bits[:num_qubits, qubit]):
+            source = row + num_qubits
+            exponent = 2 * scratch_r + 2 * int(self.signs[source])
+            exponent += int(
+                _phase_exponents(
+                    self.x_bits[source], self.z_bits[source], scratch_x, scratch_z
+                ).sum()
+            )
+            scratch_r = int(exponent % 4 == 2)
+            scratch_x ^= self.x_bits[source]
+            scratch_z ^= self.z_bits[source]
+        return scratch_r
+
+
+class StabilizerSimulator:
+    """
+    Samples measurements of Clifford-only circuit grids in polynomial time,
+    so grids can have far more wires than a statevector could hold
+    """
+
+    @staticmethod
+    def run(operations, num_qubits):
+        """
+        Apply Clifford gate operations to |0...0>
+
+        Returns:
+            StabilizerTableau: tableau of the resulting state
+        """
+        tableau = StabilizerTableau(num_qubits)
+        for operation in operations:
+            tableau.apply(operation)
+        return tableau
+
+    def sample(self, operations, num_qubits, shots=1, rng=None):
+        """
+        Measure all qubits after applying gate operations
+
+        Returns:
+            list: one integer per shot, with qubit q as bit q
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        prepared = self.run(operations, num_qubits)
+        outcomes = []
+        for _ in range(shots):
+            tableau = prepared.copy()
+            outcome = 0
+            for qubit in range(num_qubits):
+                outcome |= tableau.measure(qubit, rng) << qubit
+            outcomes.append(outcome)
+        return outcomes
+
+
+def sample_circuit_grid(circuit_grid_model, shots=None, sampler=None):
+    """
+    Measure all wires of a circuit grid. Small grids are sampled from the
+    dense probabilities, larger Clifford-only grids from a stabilizer tableau.
+
+    Parameters:
+    shots (integer): number of outcomes to draw, or None for a single one
+    sampler (MeasurementSampler): sampler of the dense probabilities, whose
+        generator also draws the tableau outcomes
+
+    Returns:
+        integer, or list of integers when shots is given, with wire q as bit q
+    """
+    sampler = sampler if sampler is not None else MeasurementSampler()
+    num_qubits = circuit_grid_model.max_wires
+
+    if num_qubits > DENSE_QUBIT_LIMIT:
+        operations = grid_operations(circuit_grid_model)
+        if is_clifford(operations):
+            outcomes = StabilizerSimulator().sample(
+                operations, num_qubits, 1 if shots is None else shots, sampler.rng
+            )
+            return outcomes[0] if shots is None else outcomes
+
+    outcomes = sampler.sample(circuit_grid_model.get_probabilities(), shots)
+    if shots is None:
+        return outcomes
+    return [int(outcome) for outcome in outcomes]
@@ -0,0 +1,359 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+NumPy statevector simulation of the circuit grid model
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_optimizer import ROTATION_GATES, optimize_operations
+
+# A single gate taken from the circuit grid, in the form the simulator applies it
+GateOperation = namedtuple(
+    "GateOperation", ["node_type", "wire", "radians", "controls", "swap"]
+)
+
+GATE_MATRICES = {
+    node_types.IDEN: np.eye(2, dtype=complex),
+    node_types.X: np.array([[0, 1], [1, 0]], dtype=complex),
+    node_types.Y: np.array([[0, -1j], [1j, 0]], dtype=complex),
+    node_types.Z: np.array([[1, 0], [0, -1]], dtype=complex),
+    node_types.S: np.array([[1, 0], [0, 1j]], dtype=complex),
+    node_types.SDG: np.array([[1, 0], [0, -1j]], dtype=complex),
+    node_types.T: np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+    node_types.TDG: np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=complex),
+    node_types.H: np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+}
+
+
+def rotation_matrix(node_type, radians):
+    """
+    Get the matrix of an Rx/Ry/Rz rotation
+
+    Parameters:
+    node_type (integer): X, Y or Z node type giving the rotation axis
+    radians (float): angle of rotation (in radians)
+    """
+    cos = np.cos(radians / 2)
+    sin = np.sin(radians / 2)
+    if node_type == node_types.X:
+        return np.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+    if node_type == node_types.Y:
+        return np.array([[cos, -sin], [sin, cos]], dtype=complex)
+    return np.array(
+        [[np.exp(-0.5j * radians), 0], [0, np.exp(0.5j * radians)]], dtype=complex
+    )
+
+
+def operation_matrix(operation):
+    """
+    Get the single qubit matrix applied to the target wire of an operation
+    """
+    if operation.radians != 0 and operation.node_type in ROTATION_GATES:
+        return rotation_matrix(operation.node_type, operation.radians)
+    return GATE_MATRICES[operation.node_type]
+
+
+SIMULATED_NODE_TYPES = np.array(
+    [
+        node_types.X,
+        node_types.Y,
+        node_types.Z,
+        node_types.S,
+        node_types.SDG,
+        node_types.T,
+        node_types.TDG,
+        node_types.H,
+    ]
+)
+
+
+def node_operation(node, wire_num):
+    """
+    Convert a node record of the circuit grid into a gate operation,
+    following the same rules as CircuitGridModel.construct_circuit
+
+    Parameters:
+    node (numpy.void): record of CircuitGridModel.nodes
+    wire_num (integer): wire the node is placed on
+
+    Returns:
+        GateOperation, or None if the node does not act on the state
+    """
+    node_type, radians, ctrl_a, ctrl_b, swap = node.item()
+    controls = tuple(ctrl for ctrl in (ctrl_a, ctrl_b) if ctrl != -1)
+    if swap != -1:
+        return GateOperation(node_types.SWAP, wire_num, 0.0, controls, swap)
+    if node_type in GATE_MATRICES and node_type != node_types.IDEN:
+        return GateOperation(node_type, wire_num, radians, controls, -1)
+    return None
+
+
+def nodes_operations(nodes_in_column):
+    """
+    Get gate operations of a column of node records, in wire order
+    """
+    active_wires = np.flatnonzero(
+        np.isin(nodes_in_column["node_type"], SIMULATED_NODE_TYPES)
+        | (nodes_in_column["swap"] != -1)
+    )
+    return [
+        node_operation(nodes_in_column[wire_num], int(wire_num))
+        for wire_num in active_wires
+    ]
+
+
+def column_operations(circuit_grid_model, column_num):
+    """
+    Get gate operations of a column on the circuit grid, in wire order
+    """
+    return nodes_operations(circuit_grid_model.nodes[:, column_num])
+
+
+def grid_operations(circuit_grid_model):
+    """
+    Get gate operations of the whole circuit grid, column by column
+    """
+    operations = []
+    for column_num in range(circuit_grid_model.max_columns):
+        operations.extend(column_operations(circuit_grid_model, column_num))
+    return operations
+
+
+def batch_column_operations(nodes, column_num):
+    """
+    Get gate operations of a column across a batch of grids, identical
+    columns are converted only once
+
+    Parameters:
+    nodes (ndarray): structured array of NODE_DTYPE, shape (batch, wires, columns)
+    column_num (integer): column to convert
+
+    Returns:
+        dict: GateOperation -> array of batch indices it applies to
+    """
+    columns = np.ascontiguousarray(nodes[:, :, column_num])
+    keys = columns.view(np.dtype((np.void, columns.dtype.itemsize * columns.shape[1])))
+    _, first_indices, inverse = np.unique(
+        keys.ravel(), return_index=True, return_inverse=True
+    )
+
+    batch_indices = {}
+    for unique_num, first_index in enumerate(first_indices):
+        members = np.flatnonzero(inverse.ravel() == unique_num)
+        for operation in nodes_operations(columns[first_index]):
+            batch_indices.setdefault(operation, []).append(members)
+    return {
+        operation: np.concatenate(members)
+        for operation, members in batch_indices.items()
+    }
+
+
+def zero_state(num_qubits, batch_shape=()):
+    """
+    Get |0...0> as a tensor with one axis of length 2 per qubit. Qubit q is
+    on axis -(q + 1), so flattening gives the usual little-endian ordering.
+    """
+    state = np.zeros(tuple(batch_shape) + (2,) * num_qubits, dtype=complex)
+    state[(Ellipsis,) + (0,) * num_qubits] = 1
+    return state
+
+
+def _index(num_qubits, fixed_bits):
+    """
+    Build an index selecting the slice of a state tensor where
+    the given wires hold the given bits
+    """
+    index = [slice(None)] * num_qubits
+    for wire_num, bit in fixed_bits.items():
+        index[num_qubits - 1 - wire_num] = slice(bit, bit + 1)
+    return (Ellipsis,) + tuple(index)
+
+
+def apply_matrix(state, num_qubits, matrix, wire_num, controls=()):
+    """
+    Apply a (controlled) single qubit matrix in place on a state tensor
+
+    Parameters:
+    state (ndarray): state tensor, possibly with leading batch axes
+    num_qubits (integer): number of qubits of the state
+    matrix (ndarray): 2x2 matrix
+    wire_num (integer): target wire
+    controls (tuple): control wires
+    """
+    fixed_bits = dict.fromkeys(controls, 1)
+    fixed_bits[wire_num] = 0
+    amplitudes_0 = state[_index(num_qubits, fixed_bits)]
+    fixed_bits[wire_num] = 1
+    amplitudes_1 = state[_index(num_qubits, fixed_bits)]
+
+    if matrix[0, 1] == 0 and matrix[1, 0] == 0:
+        # diagonal gates only rescale amplitudes
+        if matrix[0, 0] != 1:
+            amplitudes_0 *= matrix[0, 0]
+        if matrix[1, 1] != 1:
+            amplitudes_1 *= matrix[1, 1]
+        return state
+
+    new_amplitudes_0 = matrix[0, 0] * amplitudes_0 + matrix[0, 1] * amplitudes_1
+    amplitudes_1 *= matrix[1, 1]
+    amplitudes_1 += matrix[1, 0] * amplitudes_0
+    amplitudes_0[...] = new_amplitudes_0
+    return state
+
+
+def apply_swap(state, num_qubits, wire_a, wire_b, controls=()):
+    """
+    Apply a (controlled) swap in place on a state tensor
+    """
+    fixed_bits = dict.fromkeys(controls, 1)
+    fixed_bits.update({wire_a: 0, wire_b: 1})
+    amplitudes_01 = state[_index(num_qubits, fixed_bits)]
+    fixed_bits.update({wire_a: 1, wire_b: 0})
+    amplitudes_10 = state[_index(num_qubits, fixed_bits)]
+
+    swapped = amplitudes_01.copy()
+    amplitudes_01[...] = amplitudes_10
+    amplitudes_10[...] = swapped
+    return state
+
+
+def apply_operation(state, num_qubits, operation):
+    """
+    Apply a gate operation in place on a state tensor
+    """
+    if operation.node_type == node_types.SWAP:
+        return apply_swap(
+            state, num_qubits, operation.wire, operation.swap, operation.controls
+        )
+    return apply_matrix(
+        state,
+        num_qubits,
+        operation_matrix(operation),
+        operation.wire,
+        operation.controls,
+    )
+
+
+def probabilities_from_statevector(statevector):
+    """
+    Get basis state probabilities from a statevector
+    """
+    return statevector.real**2 + statevector.imag**2
+
+
+class StatevectorSimulator:
+    """
+    Simulates the circuit grid model with NumPy tensor kernels
+    """
+
+    def __init__(self, optimize=True):
+        self.optimize = optimize
+        # gates removed by the peephole pass in the last simulation
+        self.eliminated_gates = 0
+
+    def run(self, operations, num_qubits):
+        """
+        Apply gate operations to |0...0> and return the flat statevector
+        """
+        if self.optimize:
+            operations, self.eliminated_gates = optimize_operations(operations)
+        state = zero_state(num_qubits)
+        for operation in operations:
+            apply_operation(state, num_qubits, operation)
+        return state.reshape(-1)
+
+    def statevector(self, circuit_grid_model):
+        """
+        Get the statevector of the circuit on the circuit grid
+        """
+        return self.run(
+            grid_operations(circuit_grid_model), circuit_grid_model.max_wires
+        )
+
+    def probabilities(self, circuit_grid_model):
+        """
+        Get basis state probabilities of the circuit on the circuit grid
+        """
+        return probabilities_from_statevector(self.statevector(circuit_grid_model))
+
+    @staticmethod
+    def batch_statevectors(nodes):
+        """
+        Simulate a stack of circuit grids of the same shape in one pass.
+        Gates in a column act on distinct wires, so each distinct gate is
+        applied once, to every grid of the batch that has it.
+
+        Parameters:
+        nodes (ndarray): structured array of NODE_DTYPE, shape
+            (batch, wires, columns), e.g. stacked CircuitGridModel.copy_nodes()
+
+        Returns:
+            ndarray: statevectors, shape (batch, 2**wires)
+        """
+        batch_size, num_qubits, max_columns = nodes.shape
+        state = zero_state(num_qubits, (batch_size,))
+
+        for column_num in range(max_columns):
+            for operation, members in batch_column_operations(
+                nodes, column_num
+            ).items():
+                if len(members) == batch_size:
+                    apply_operation(state, num_qubits, operation)
+                else:
+                    state[members] = apply_operation(
+                        state[members], num_qubits, operation
+                    )
+        return state.reshape(batch_size, -1)
+
+    def batch_probabilities(self, nodes):
+        """
+        Get basis state probabilities of a stack of circuit grids
+
+        Parameters:
+        nodes (ndarray): structured array of NODE_DTYPE, shape (batch, wires, columns)
+
+        Returns:
+            ndarray: probabilities, shape (batch, 2**wires)
+        """
+        return probabilities_from_statevector(self.batch_statevectors(nodes))
+
+
+class QiskitSimulator:
+    """
+    Reference simulator running the circuit built by qiskit, kept
+    for cross-checking the NumPy simulator
+    """
+
+    @staticmethod
+    def statevector(circuit_grid_model):
+        """
+        Get the statevector of the circuit on the circuit grid
+        """
+        # pylint: disable=import-outside-toplevel
+        from qiskit.quantum_info import Statevector
+
+        return np.asarray(Statevector(circuit_grid_model.construct_circuit()).data)
+
+    def probabilities(self, circuit_grid_model):
+        """
+        Get basis state probabilities of the circuit on the circuit grid
+        """
+        return probabilities_from_statevector(self.statevector(circuit_grid_model))
@@ -19,12 +19,14 @@ Utilities for loading resources and quantum states
 """
 
 from .ball import Ball
+from .game_core import GameCore
 from .input import Input
 from .level import Level
 from .scene import Scene
 from .score import Score
 from .sound import Sound
 from .font import Font
+from .lru_cache import LRUCache
 
 from .colors import *
 from .gamepad import *
@@ -24,6 +24,13 @@ import random
 
 import pygame
 
+from qpong.utils.collision import (
+    AXIS_X,
+    AXIS_Y,
+    crossing_time,
+    overlap,
+    sweep_box,
+)
 from qpong.utils.colors import WHITE
 from qpong.utils.parameters import (
     WIDTH_UNIT,
@@ -74,13 +81,26 @@ class Ball(pygame.sprite.Sprite):
 
         self.xpos = 0
         self.ypos = 0
+        # position before the last physics tick, for render interpolation
+        self.prev_xpos = 0
+        self.prev_ypos = 0
         self.speed = 0
         self.initial_speed_factor = 0.8
         self.direction = 0
 
+        # measurement zones, entered when the ball crosses their inner side
+        self.left_measure_end = self.left_edge + 12 * self.width_unit
+        self.right_measure_start = self.right_edge - 12 * self.width_unit
+
         # initialize ball action type, measure and bounce flags
         self.ball_action = NOTHING
         self.measure_flag = NO
+        self.entered_zone = NOTHING
+        # fraction of the physics tick the ball has still to move
+        self.tick_left = 0.0
+
+        # callbacks notified when the ball changes course horizontally
+        self._subscribers = []
 
         # initialize ball reset on the left
         self.reset_position = LEFT
@@ -89,25 +109,191 @@ class Ball(pygame.sprite.Sprite):
         self.sound = Sound()
         self.score = Score()
 
-    def update(self):
+    def update(self, paddles=()):
         """
-        Update ball
+        Move the ball by one physics tick. Bounces off the top and bottom
+        edges and the paddles happen at their exact time of impact within
+        the tick, so that the ball cannot pass through them at any speed.
+        The move stops early when the ball enters a measurement zone, and
+        the rest of the tick is moved by the next call.
+
+        Parameters:
+        paddles (list): rects of the paddles
+
+        Returns:
+            boolean: True if the tick is complete, False if the ball
+                stopped in a measurement zone
         """
-        radians = math.radians(self.direction)
+        if self.tick_left == 0:
+            self.prev_xpos = self.xpos
+            self.prev_ypos = self.ypos
+            self.tick_left = 1.0
+
+        # move until the tick is used up. Every bounce turns the ball away
+        # from what it hit, so the same bounce cannot repeat without moving
+        while self.tick_left > 1e-9:
+            radians = math.radians(self.direction)
+            delta_x = self.speed * self.tick_left * math.sin(radians)
+            delta_y = -self.speed * self.tick_left * math.cos(radians)
+
+            time, event = self.next_event(delta_x, delta_y, paddles)
+            self.xpos += delta_x * time
+            self.ypos += delta_y * time
+            self.tick_left *= 1 - time
+
+            if event is None:
+                break
+            if event in (MEASURE_LEFT, MEASURE_RIGHT):
+                self.entered_zone = event
+                break
+            if event == AXIS_X:
+                self.bounce_edge()
+            else:
+                self.direction = (180 - self.direction) % 360
+                self.sound.edge_sound.play()
 
-        self.xpos += self.speed * math.sin(radians)
-        self.ypos -= self.speed * math.cos(radians)
+        if self.tick_left < 1e-9:
+            self.tick_left = 0.0
 
         # Update ball position
         self.rect.x = self.xpos
         self.rect.y = self.ypos
+        return self.tick_left == 0
+
+    def next_event(self, delta_x, delta_y, paddles):
+        """
+        Find the first event of a move: the ball hitting an edge or a
+        paddle, or entering the measurement zone it is heading to
+
+        Parameters:
+        delta_x (float): horizontal displacement of the move
+        delta_y (float): vertical displacement of the move
+        paddles (list): rects of the paddles
+
+        Returns:
+            tuple: (time of the event between 0 and 1, event) where the event is
+                AXIS_X for a horizontal bounce, AXIS_Y for a vertical bounce,
+                MEASURE_LEFT or MEASURE_RIGHT, or None if nothing happens
+        """
+        events = []
+
+        if delta_y < 0:
+            events.append((self._edge_time(self.ypos, delta_y, self.top_edge), AXIS_Y))
+        elif delta_y > 0:
+            bottom = self.bottom_edge - 1 * self.height
+            events.append((self._edge_time(self.ypos, delta_y, bottom), AXIS_Y))
+
+        box = (self.xpos, self.ypos, self.width, self.height)
+        for paddle in paddles:
+            if overlap(box, paddle):
+                # a paddle moved onto the ball, bounce unless already leaving
+                if (paddle.centerx - self.xpos - self.width / 2) * delta_x > 0:
+                    events.append((0.0, AXIS_X))
+                continue
+            impact = sweep_box(box, (delta_x, delta_y), paddle)
+            if impact is not None:
+                events.append(impact)
+
+        if delta_x > 0 and self.xpos < self.right_measure_start:
+            events.append(
+                (
+                    crossing_time(self.xpos, delta_x, self.right_measure_start),
+                    MEASURE_RIGHT,
+                )
+            )
+        elif delta_x < 0 and self.xpos > self.left_measure_end:
+            events.append(
+                (crossing_time(self.xpos, delta_x, self.left_measure_end), MEASURE_LEFT)
+            )
+
+        events = [event for event in events if event[0] is not None]
+        if not events:
+            return 1.0, None
+        return min(events, key=lambda event: event[0])
+
+    def quiet_ticks(self, paddles=(), lookahead=240):
+        """
+        Count the whole physics ticks the ball moves in a straight line
+        before anything can happen to it: reaching an edge, a measurement
+        zone, or the column a paddle moves in
+
+        Parameters:
+        paddles (list): rects of the paddles, which may move meanwhile
+        lookahead (integer): most ticks counted
+
+        Returns:
+            integer: number of ticks coast can move
+        """
+        if self.tick_left != 0:
+            return 0
+
+        # the ball is in the column of a paddle
+        columns = []
+        for paddle in paddles:
+            if paddle.x < self.xpos + self.width and self.xpos < paddle.right:
+                return 0
+            columns.append(
+                (
+                    paddle.x,
+                    self.top_edge - self.height,
+                    paddle.width,
+                    self.bottom_edge - self.top_edge + 2 * self.height,
+                )
+            )
+
+        radians = math.radians(self.direction)
+        delta_x = self.speed * lookahead * math.sin(radians)
+        delta_y = -self.speed * lookahead * math.cos(radians)
+
+        time, _ = self.next_event(delta_x, delta_y, columns)
+        for edge in (self.left_edge, self.right_edge):
+            crossing = crossing_time(self.xpos, delta_x, edge)
+            if crossing is not None:
+                time = min(time, crossing)
+        # keep a tick away from the event against rounding
+        return max(0, math.ceil(time * lookahead) - 2)
+
+    def coast(self, ticks):
+        """
+        Move the ball by whole physics ticks in which nothing happens to it,
+        counted by quiet_ticks, ending where update would have left it
+        """
+        radians = math.radians(self.direction)
+        delta_x = self.speed * math.sin(radians)
+        delta_y = -self.speed * math.cos(radians)
+
+        xpos, ypos = self.xpos, self.ypos
+        for _ in range(ticks):
+            self.prev_xpos, self.prev_ypos = xpos, ypos
+            xpos += delta_x
+            ypos += delta_y
+        self.xpos, self.ypos = xpos, ypos
+
+        self.rect.x = self.xpos
+        self.rect.y = self.ypos
+        self.ball_action = NOTHING
+        self.measure_flag = NO
+
+    @staticmethod
+    def _edge_time(position, delta, edge):
+        """
+        Find when the ball reaches an edge it moves towards,
+        right away if it is already past the edge
+        """
+        if (edge - position) * delta <= 0:
+            return 0.0
+        return crossing_time(position, delta, edge)
 
-        if self.ypos <= self.top_edge:
-            self.direction = (180 - self.direction) % 360
-            self.sound.edge_sound.play()
-        if self.ypos > self.bottom_edge - 1 * self.height:
-            self.direction = (180 - self.direction) % 360
-            self.sound.edge_sound.play()
+    def interpolate(self, alpha):
+        """
+        Place the ball rect between its last two physics positions,
+        for rendering between physics ticks
+
+        Parameters:
+        alpha (float): fraction of the tick from the previous position
+        """
+        self.rect.x = self.prev_xpos + (self.xpos - self.prev_xpos) * alpha
+        self.rect.y = self.prev_ypos + (self.ypos - self.prev_ypos) * alpha
 
     def reset(self):
         """
@@ -126,6 +312,13 @@ class Ball(pygame.sprite.Sprite):
             self.direction = random.randrange(-120, -30)
             self.reset_position = LEFT
 
+        # no interpolation across the jump
+        self.prev_xpos = self.xpos
+        self.prev_ypos = self.ypos
+        self.entered_zone = NOTHING
+        self.tick_left = 0.0
+        self._notify()
+
     def bounce_edge(self):
         """
         Bounce ball off a screen edge
@@ -133,6 +326,34 @@ class Ball(pygame.sprite.Sprite):
         self.direction = (360 - self.direction) % 360
         self.speed *= 1.1
         self.sound.bounce_sound.play()
+        self._notify()
+
+    def subscribe(self, callback):
+        """
+        Register a callback called with the ball after it bounced off
+        a paddle or was reset. Bounces off the top and bottom edges do
+        not change where the ball goes horizontally, so they are not notified.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Remove a callback registered with subscribe
+        """
+        self._subscribers.remove(callback)
+
+    def _notify(self):
+        """
+        Call the subscribed callbacks
+        """
+        for callback in self._subscribers:
+            callback(self)
+
+    def heading_right(self):
+        """
+        Check if the ball is moving towards the quantum player
+        """
+        return math.sin(math.radians(self.direction)) > 0
 
     def get_xpos(self):
         """
@@ -159,31 +380,12 @@ class Ball(pygame.sprite.Sprite):
             self.sound.lost_sound.play(3)
             self.score.update(1)
 
-        elif (
-            self.left_edge + 10 * self.width_unit
-            <= self.xpos
-            < self.left_edge + 12 * self.width_unit
-        ):
-            # measure the ball when it reaches the left measurement zone
-            if self.measure_flag == NO:
-                self.ball_action = MEASURE_LEFT
-                self.measure_flag = YES
-            else:
-                self.ball_action = NOTHING
-
-        elif (
-            self.right_edge - 12 * self.width_unit
-            <= self.xpos
-            < self.right_edge - 10 * self.width_unit
-        ):
-            # measure the ball when it reaches the right measurement zone
-            if self.measure_flag == NO:
-                # do measurement if not yet done
-                self.ball_action = MEASURE_RIGHT
-                self.measure_flag = YES
-            else:
-                # do nothing if measurement was done already
-                self.ball_action = NOTHING
+        elif self.entered_zone != NOTHING:
+            # measure the ball when it entered the measurement zone
+            # it is heading to, which is done once per pass
+            self.ball_action = self.entered_zone
+            self.measure_flag = YES
+            self.entered_zone = NOTHING
 
         elif self.xpos > self.right_edge:
             # reset the ball when it reaches beyond right edge
@@ -192,7 +394,7 @@ class Ball(pygame.sprite.Sprite):
             self.score.update(0)
 
         else:
-            # reset flags and do nothing when the ball is outside measurement and bounce zone
+            # reset flags and do nothing when the ball did not enter a measurement zone
             self.ball_action = NOTHING
             self.measure_flag = NO
 
@@ -0,0 +1,101 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Swept collision of moving axis-aligned boxes
+"""
+
+import math
+
+# axis of the faces hit in a collision
+AXIS_X = "x"
+AXIS_Y = "y"
+
+
+def sweep_box(box, velocity, target):
+    """
+    Find when a box moving in a straight line first touches a fixed box
+
+    Parameters:
+    box (tuple): (x, y, width, height) of the moving box at the start
+    velocity (tuple): (x, y) displacement over the whole move
+    target (tuple or pygame.Rect): (x, y, width, height) of the fixed box
+
+    Returns:
+        tuple: (time of impact between 0 and 1, AXIS_X or AXIS_Y of the
+            faces hit), or None if the boxes do not touch during the move
+            or already overlap at the start
+    """
+    x_entry, x_exit = _sweep_axis(box, velocity, target, 0)
+    y_entry, y_exit = _sweep_axis(box, velocity, target, 1)
+
+    entry = max(x_entry, y_entry)
+    if entry > min(x_exit, y_exit) or not 0 <= entry <= 1:
+        return None
+    return entry, AXIS_X if x_entry >= y_entry else AXIS_Y
+
+
+def _sweep_axis(box, velocity, target, axis):
+    """
+    Get the times a moving box starts and stops overlapping
+    a fixed one along an axis, 0 for x and 1 for y
+    """
+    position, size, delta = box[axis], box[axis + 2], velocity[axis]
+    target_start = target[axis]
+    target_end = target_start + target[axis + 2]
+    if delta > 0:
+        return (
+            (target_start - (position + size)) / delta,
+            (target_end - position) / delta,
+        )
+    if delta < 0:
+        return (
+            (target_end - position) / delta,
+            (target_start - (position + size)) / delta,
+        )
+    if position + size <= target_start or position >= target_end:
+        return math.inf, -math.inf
+    return -math.inf, math.inf
+
+
+def overlap(box, target):
+    """
+    Check if two boxes overlap
+    """
+    xpos, ypos, width, height = box
+    target_x, target_y, target_width, target_height = target
+    return (
+        xpos < target_x + target_width
+        and target_x < xpos + width
+        and ypos < target_y + target_height
+        and target_y < ypos + height
+    )
+
+
+def crossing_time(position, delta, boundary):
+    """
+    Find when a point moving along an axis reaches a boundary
+
+    Returns:
+        float: time between 0 and 1, or None if it is not reached
+    """
+    if delta == 0:
+        return None
+    time = (boundary - position) / delta
+    if 0 <= time <= 1:
+        return time
+    return None
@@ -18,10 +18,120 @@
 Various fonts used through out the game
 """
 
+import pygame
+
+from qpong.utils.lru_cache import LRUCache
 from qpong.utils.parameters import WIDTH_UNIT
 
 from qpong.utils.resources import load_font
 
+
+class TextCache(LRUCache):
+    """
+    Bounded least-recently-used cache of rendered text surfaces
+    """
+
+    def __init__(self, maxsize=256):
+        LRUCache.__init__(self, maxsize)
+
+    def render(self, font, font_key, text, antialias, color, background=None):
+        """
+        Render text, reusing the surface of an earlier identical call.
+        The surface is shared, so it must not be drawn on.
+
+        Parameters:
+        font (pygame.font.Font): font rendering the text
+        font_key (tuple): (name, size) identifying the font
+        """
+        key = (
+            font_key,
+            text,
+            tuple(pygame.Color(color)),
+            bool(antialias),
+            None if background is None else tuple(pygame.Color(background)),
+        )
+        surface = self.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color, background)
+            self.put(key, surface)
+        return surface
+
+
+class CachedFont:
+    """
+    Font face whose rendered text goes through a TextCache,
+    other attributes are those of the pygame font
+    """
+
+    def __init__(self, font, font_key, text_cache):
+        self.font = font
+        self.font_key = font_key
+        self.text_cache = text_cache
+
+    def render(self, text, antialias, color, background=None):
+        """
+        Render text like pygame.font.Font.render, returning a shared surface
+        """
+        return self.text_cache.render(
+            self.font, self.font_key, text, antialias, color, background
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+
+class FontRegistry:
+    """
+    Process-wide registry loading each (name, size) font face once.
+    Faces and rendered text are dropped when pygame quits.
+    """
+
+    def __init__(self, text_cache=None):
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self._fonts = {}
+        self._quit_registered = False
+
+    def get(self, name, size):
+        """
+        Get a font face
+
+        Parameters:
+        name (string): font file name
+        size (integer): font size
+
+        Returns:
+            CachedFont: shared font face
+        """
+        if not self._quit_registered:
+            pygame.register_quit(self._on_quit)
+            self._quit_registered = True
+
+        font_key = (name, size)
+        font = self._fonts.get(font_key)
+        if font is None:
+            font = CachedFont(load_font(name, size), font_key, self.text_cache)
+            self._fonts[font_key] = font
+        return font
+
+    def _on_quit(self):
+        """
+        Drop fonts of the pygame session that ended, pygame
+        forgets quit callbacks once they are called
+        """
+        self._quit_registered = False
+        self.clear()
+
+    def clear(self):
+        """
+        Drop all font faces and rendered text
+        """
+        self._fonts.clear()
+        self.text_cache.clear()
+
+
+font_registry = FontRegistry()
+
+
 # pylint: disable=too-few-public-methods
 class Font:
     """
@@ -29,9 +139,9 @@ class Font:
     """
 
     def __init__(self):
-        self.gameover_font = load_font("bit5x3.ttf", 10 * WIDTH_UNIT)
-        self.credit_font = load_font("bit5x3.ttf", 2 * WIDTH_UNIT)
-        self.replay_font = load_font("bit5x3.ttf", 5 * WIDTH_UNIT)
-        self.score_font = load_font("bit5x3.ttf", 12 * WIDTH_UNIT)
-        self.vector_font = load_font("bit5x3.ttf", 3 * WIDTH_UNIT)
-        self.player_font = load_font("bit5x3.ttf", 3 * WIDTH_UNIT)
+        self.gameover_font = font_registry.get("bit5x3.ttf", 10 * WIDTH_UNIT)
+        self.credit_font = font_registry.get("bit5x3.ttf", 2 * WIDTH_UNIT)
+        self.replay_font = font_registry.get("bit5x3.ttf", 5 * WIDTH_UNIT)
+        self.score_font = font_registry.get("bit5x3.ttf", 12 * WIDTH_UNIT)
+        self.vector_font = font_registry.get("bit5x3.ttf", 3 * WIDTH_UNIT)
+        self.player_font = font_registry.get("bit5x3.ttf", 3 * WIDTH_UNIT)
@@ -0,0 +1,267 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Rules of a QPong match, advanced in fixed physics ticks
+"""
+
+from qpong.utils.paddle_ai import ClassicalPaddleAI
+from qpong.utils.parameters import (
+    CLASSICAL_COMPUTER,
+    QUANTUM_COMPUTER,
+    WIN_SCORE,
+    MEASURE_RIGHT,
+    CLASSICAL_REACTION_TIME,
+    CLASSICAL_JITTER,
+    CLASSICAL_PADDLE_SPEED,
+    EDIT_WINDOW,
+)
+from qpong.utils.timestep import FixedTimestep
+
+
+class GameCore:
+    """
+    Moves the ball, measures the quantum paddle and moves the classical
+    paddle, one physics tick at a time. Nothing is drawn or read from
+    input devices, so the same rules run in the game window and headless.
+    """
+
+    # pylint: disable=too-many-instance-attributes disable=too-many-arguments
+    def __init__(
+        self,
+        scene,
+        level,
+        ball,
+        simulation_worker=None,
+        refresh_paddle=None,
+        reaction_time=CLASSICAL_REACTION_TIME,
+        jitter=CLASSICAL_JITTER,
+        paddle_speed=CLASSICAL_PADDLE_SPEED,
+    ):
+        """
+        Parameters:
+        scene (Scene): scene with the number of qubits
+        level (Level): level already set up
+        ball (Ball): the ball
+        simulation_worker (SimulationWorker): worker the circuit grid is
+            simulated on after edits, measurements are then not drawn
+            ahead of time while it is busy
+        refresh_paddle (callable): shows the statevector paddle again a
+            moment after a measurement, by default without drawing it
+        reaction_time (integer): time (in milliseconds) the classical
+            paddle takes to react when the ball changes course
+        jitter (float): largest distance (in WIDTH_UNIT) the classical
+            paddle aims away from the ball
+        paddle_speed (float): largest move of the classical paddle per
+            physics tick (in WIDTH_UNIT)
+        """
+        self.scene = scene
+        self.level = level
+        self.ball = ball
+        self.simulation_worker = simulation_worker
+        self.refresh_paddle = (
+            refresh_paddle if refresh_paddle is not None else self.update_paddle
+        )
+        self.timestep = FixedTimestep()
+        self.classical_ai = ClassicalPaddleAI(
+            level.left_paddle, ball, reaction_time, jitter, paddle_speed
+        )
+
+        # physics time of the last measurement, far ahead when none is pending
+        self.measure_time = 100000
+        # points played since the start, and the ticks each one took
+        self.rallies = 0
+        self.rally_lengths = []
+        self._rally_start = 0
+        # outcome of every measurement of the quantum paddle
+        self.outcomes = []
+        # revision of the circuit grid and physics time of its last edit
+        self._edit_revision = level.circuit_grid_model.revision
+        self._edit_time = 0
+
+    def update_paddle(self):
+        """
+        Show the statevector paddle of the current circuit grid
+        """
+        self.level.statevector_grid.paddle_before_measurement(
+            self.level.circuit_grid_model, self.scene.qubit_num
+        )
+        self.level.right_statevector.arrange()
+
+    def winner(self):
+        """
+        Get the player who reached WIN_SCORE, or None
+        """
+        for player in (CLASSICAL_COMPUTER, QUANTUM_COMPUTER):
+            if self.ball.score.get_score(player) >= WIN_SCORE:
+                return player
+        return None
+
+    def tick(self):
+        """
+        Advance the match by one physics tick
+        """
+        level = self.level
+        ball = self.ball
+        self.timestep.step()
+
+        # draw the next measurement early while the ball approaches, so the
+        # measurement tick only moves the paddle
+        if ball.heading_right():
+            self.premeasure()
+
+        # move the ball through the tick, bouncing off the paddles, and
+        # measure when it stops on entering a measurement zone
+        tick_done = False
+        while not tick_done:
+            tick_done = ball.update((level.left_paddle.rect, level.right_paddle.rect))
+            points = ball.score.computer + ball.score.player
+
+            # check ball location and decide what to do
+            ball.action()
+
+            if ball.score.computer + ball.score.player != points:
+                self.rallies += 1
+                self.rally_lengths.append(self.timestep.ticks - self._rally_start)
+                self._rally_start = self.timestep.ticks
+            if ball.ball_action == MEASURE_RIGHT:
+                self.measure()
+
+        self.end_tick()
+
+    def fast_forward(self, max_ticks):
+        """
+        Advance the match by up to max_ticks physics ticks, as tick would.
+        Ticks in which the ball cannot hit anything only move the ball and
+        the classical paddle, without looking for collisions.
+
+        Returns:
+            integer: number of ticks run
+        """
+        level = self.level
+        ball = self.ball
+        ticks = min(
+            max_ticks,
+            ball.quiet_ticks((level.left_paddle.rect, level.right_paddle.rect)),
+        )
+        if ticks == 0:
+            self.tick()
+            return 1
+
+        if ball.heading_right():
+            self.premeasure()
+        ball.coast(ticks)
+        left = ticks
+        while left > 0:
+            if self.classical_ai.settled:
+                # nothing happens until the paddle is refreshed
+                idle = min(left, self.timestep.ticks_until(self.measure_time + 400))
+                if idle > 0:
+                    self.timestep.step(idle)
+                    left -= idle
+                    continue
+            self.timestep.step()
+            self.end_tick()
+            left -= 1
+        return ticks
+
+    def end_tick(self):
+        """
+        Move the classical paddle and refresh the quantum paddle at the end
+        of a physics tick
+        """
+        self.move_classical_paddle()
+
+        if self.timestep.time - self.measure_time > 400:
+            # refresh the paddle a moment after measurement to update visual
+            self.refresh_paddle()
+            # add a buffer time before measure again
+            self.measure_time = self.timestep.time + 100000
+
+    def frozen(self):
+        """
+        Check if the circuit grid is frozen: it was not edited for EDIT_WINDOW,
+        and with a worker, the worker has simulated its current revision
+        """
+        revision = self.level.circuit_grid_model.revision
+        if revision != self._edit_revision:
+            self._edit_revision = revision
+            self._edit_time = self.timestep.time
+        if self.timestep.time - self._edit_time < EDIT_WINDOW:
+            return False
+        worker = self.simulation_worker
+        return worker is None or (
+            worker.latest is not None and worker.latest.revision == revision
+        )
+
+    def premeasure(self):
+        """
+        Draw the outcome of the next measurement once the grid is frozen,
+        from the probabilities of the worker if there is one
+        """
+        if not self.frozen():
+            return
+        worker = self.simulation_worker
+        self.level.statevector_grid.premeasure(
+            self.level.circuit_grid_model,
+            None if worker is None else worker.latest.probabilities,
+        )
+
+    def simulated_probabilities(self):
+        """
+        Get the probabilities of the current grid from the worker, waiting
+        for its simulation if it is still running
+
+        Returns:
+            ndarray: probabilities, or None without a worker
+        """
+        worker = self.simulation_worker
+        if worker is None:
+            return None
+        circuit_grid_model = self.level.circuit_grid_model
+        latest = worker.latest
+        if latest is None or latest.revision != circuit_grid_model.revision:
+            if worker.submit(circuit_grid_model) is None:
+                worker.wait()
+        return worker.latest.probabilities
+
+    def measure(self):
+        """
+        Measure the circuit grid and move the quantum paddle to the outcome,
+        drawn ahead of time or else from the probabilities of the worker
+        """
+        level = self.level
+        probabilities = None
+        if not level.statevector_grid.premeasured(level.circuit_grid_model):
+            probabilities = self.simulated_probabilities()
+        pos = level.statevector_grid.paddle_after_measurement(
+            level.circuit_grid_model, self.scene.qubit_num, probabilities
+        )
+        level.right_statevector.arrange()
+        self.outcomes.append(pos)
+
+        # paddle after measurement
+        level.right_paddle.rect.y = (
+            pos * self.ball.screenheight / (2**self.scene.qubit_num)
+        )
+        self.measure_time = self.timestep.time
+
+    def move_classical_paddle(self):
+        """
+        Move the classical paddle towards where the ball will cross it
+        """
+        self.classical_ai.update(self.timestep.time)
@@ -0,0 +1,174 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Headless QPong matches, without a window, sound output or frame cap
+"""
+
+from collections import namedtuple
+import os
+import random
+import time
+
+import pygame
+
+from qpong.utils.ball import Ball
+from qpong.utils.game_core import GameCore
+from qpong.utils.level import Level
+from qpong.utils.parameters import (
+    WINDOW_SIZE,
+    CLASSICAL_COMPUTER,
+    QUANTUM_COMPUTER,
+    EASY,
+    NORMAL,
+    EXPERT,
+)
+from qpong.utils.renderer import (
+    DirtyRectRenderer,
+    draw_static_layers,
+    invalidate_changed_layers,
+)
+from qpong.utils.scene import Scene
+
+DIFFICULTIES = {"easy": EASY, "normal": NORMAL, "expert": EXPERT}
+
+# most physics ticks skipped over at once
+FAST_FORWARD_TICKS = 240
+
+# Statistics of a headless run
+HeadlessResult = namedtuple(
+    "HeadlessResult",
+    ["ticks", "rallies", "classical_points", "quantum_points", "matches", "seconds"],
+)
+
+
+def init_headless():
+    """
+    Initialize pygame with the SDL dummy video and audio drivers, unless
+    other drivers are set in the environment. The display is set up once
+    per process, later calls reuse it.
+
+    Returns:
+        pygame.Surface: display surface, needed to convert images
+    """
+    surface = pygame.display.get_surface()
+    if surface is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        surface = pygame.display.set_mode(WINDOW_SIZE)
+    return surface
+
+
+def new_match(seed=None, speed_factor=NORMAL, **core_options):
+    """
+    Set up a headless match
+
+    Parameters:
+    seed (integer): seed of the ball, classical paddle and measurements
+    speed_factor (float): initial ball speed, EASY, NORMAL or EXPERT
+    core_options: other arguments of GameCore
+
+    Returns:
+        GameCore: rules of the match, with its scene, level and ball
+    """
+    init_headless()
+    if seed is not None:
+        random.seed(seed)
+
+    scene = Scene()
+    level = Level(rng=seed)
+    ball = Ball()
+    ball.initial_speed_factor = speed_factor
+    level.setup(scene, ball)
+    ball.reset()
+    return GameCore(scene, level, ball, **core_options)
+
+
+def headless_renderer(core):
+    """
+    Set up a renderer drawing a headless match on the display surface
+    """
+    scene, level, ball = core.scene, core.level, core.ball
+    renderer = DirtyRectRenderer(
+        pygame.display.get_surface(),
+        lambda surface: draw_static_layers(surface, scene, level, ball),
+    )
+    renderer.add(ball, level.left_paddle, level.right_paddle)
+    return renderer
+
+
+def run_headless(
+    ticks=None, rallies=None, seed=None, speed_factor=NORMAL, render=False
+):
+    """
+    Play the game rules as fast as possible, with the classical paddle
+    against the quantum paddle of an empty circuit grid. A match ending
+    at WIN_SCORE is followed by another one, as when replaying.
+
+    Parameters:
+    ticks (integer): physics ticks to run
+    rallies (integer): points to play, the run stops at the first limit
+        reached, and runs 1000 rallies when neither is given
+    seed (integer): seed of the ball, classical paddle and measurements,
+        so that runs can be reproduced
+    speed_factor (float): initial ball speed, EASY, NORMAL or EXPERT
+    render (boolean): draw every tick on the display surface, to include
+        the cost of rendering
+
+    Returns:
+        HeadlessResult: statistics of the run
+    """
+    if ticks is None and rallies is None:
+        rallies = 1000
+    core = new_match(seed, speed_factor)
+    score = core.ball.score
+    renderer = headless_renderer(core) if render else None
+
+    points = [0, 0]
+    matches = 0
+    start = time.perf_counter()
+    while (ticks is None or core.timestep.ticks < ticks) and (
+        rallies is None or core.rallies < rallies
+    ):
+        if renderer is None:
+            # ticks without collisions are skipped over when not drawn
+            core.fast_forward(
+                FAST_FORWARD_TICKS if ticks is None else ticks - core.timestep.ticks
+            )
+        else:
+            core.tick()
+            invalidate_changed_layers(renderer, core.level, core.ball)
+            renderer.render()
+
+        if core.winner() is not None:
+            for scorer in (CLASSICAL_COMPUTER, QUANTUM_COMPUTER):
+                points[scorer] += score.get_score(scorer)
+            score.reset_score()
+            matches += 1
+    seconds = time.perf_counter() - start
+
+    for scorer in (CLASSICAL_COMPUTER, QUANTUM_COMPUTER):
+        points[scorer] += score.get_score(scorer)
+    return HeadlessResult(
+        core.timestep.ticks,
+        core.rallies,
+        points[CLASSICAL_COMPUTER],
+        points[QUANTUM_COMPUTER],
+        matches,
+        seconds,
+    )
@@ -31,9 +31,15 @@ class Input:
     Handle input events
     """
 
-    def __init__(self):
+    def __init__(self, simulation_worker=None, renderer=None):
         self.running = True
 
+        # optional SimulationWorker taking simulations off the main loop
+        self.simulation_worker = simulation_worker
+        # optional DirtyRectRenderer drawing changes at the end of the frame,
+        # without it every change is drawn and flipped to the display at once
+        self.renderer = renderer
+
         if not pygame.joystick.get_init():
             pygame.joystick.init()
 
@@ -48,6 +54,9 @@ class Input:
         self.gamepad_pressed_timer = 0
         self.gamepad_last_update = pygame.time.get_ticks()
 
+        # circuit grid model revision the paddle was last updated for
+        self.paddle_revision = None
+
     def handle_input(self, level, screen, scene):
         # pylint: disable=too-many-branches disable=too-many-statements
         """
@@ -106,39 +115,33 @@ class Input:
                 if event.button == gamepad.BTN_A:
                     # Place X gate
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_X:
                     # Place Y gate
                     circuit_grid.handle_input_y()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_B:
                     # Place Z gate
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_Y:
                     # Place Hadamard gate
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_RIGHT_TRIGGER:
                     # Delete gate
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_RIGHT_THUMB:
                     # Add or remove a control
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.button == gamepad.BTN_LEFT_BUMPER:
                     # Update visualizations
                     self.update_paddle(level, screen, scene)
@@ -150,114 +153,137 @@ class Input:
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) >= 0.95
                 ):
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_X
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) <= -0.95
                 ):
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) <= -0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) >= 0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_a:
                     circuit_grid.move_to_adjacent_node(MOVE_LEFT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_d:
                     circuit_grid.move_to_adjacent_node(MOVE_RIGHT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_w:
                     circuit_grid.move_to_adjacent_node(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_s:
                     circuit_grid.move_to_adjacent_node(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_x:
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_y:
                     circuit_grid.handle_input_y()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_z:
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_h:
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_SPACE:
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_c:
                     # Add or remove a control
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_UP:
                     # Move a control qubit up
                     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_DOWN:
                     # Move a control qubit down
                     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_LEFT:
                     # Rotate a gate
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_RIGHT:
                     # Rotate a gate
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.update_paddle_if_changed(level, screen, scene)
+                    self.refresh_circuit_grid(screen, circuit_grid)
                 elif event.key == pygame.K_TAB:
                     # Update visualizations
                     self.update_paddle(level, screen, scene)
 
+    def update_paddle_if_changed(self, level, screen, scene):
+        """
+        Update state vector paddle only if the circuit grid model
+        changed since the last update, so rejected edits cost nothing
+        """
+        revision = level.circuit_grid_model.revision
+        if revision != self.paddle_revision:
+            if self.simulation_worker is None:
+                self.update_paddle(level, screen, scene)
+            else:
+                result = self.simulation_worker.submit(level.circuit_grid_model)
+                if result is not None:
+                    self.show_simulation(level, scene, result)
+            self.paddle_revision = revision
+
+    def poll_simulation(self, level, scene):
+        """
+        Update state vector paddle with the newest result of the simulation
+        worker, results of revisions already edited again are skipped.
+        The worker stores every result in the simulation cache of the model.
+
+        Returns:
+            boolean: True if the paddle was updated
+        """
+        if self.simulation_worker is None:
+            return False
+        result = self.simulation_worker.poll()
+        if result is None or result.revision != level.circuit_grid_model.revision:
+            return False
+        self.show_simulation(level, scene, result)
+        return True
+
     @staticmethod
-    def update_paddle(level, screen, scene):
+    def show_simulation(level, scene, result):
+        """
+        Update state vector paddle with a result of the simulation worker
+        """
+        level.statevector_grid.paddle_before_measurement(
+            level.circuit_grid_model, scene.qubit_num, result.probabilities
+        )
+        level.right_statevector.arrange()
+
+    def update_paddle(self, level, screen, scene):
         """
         Update state vector paddle
         """
@@ -268,17 +294,21 @@ class Input:
         circuit_grid = level.circuit_grid
         statevector_grid = level.statevector_grid
 
-        circuit = circuit_grid_model.construct_circuit()
-        statevector_grid.paddle_before_measurement(circuit, scene.qubit_num)
+        statevector_grid.paddle_before_measurement(circuit_grid_model, scene.qubit_num)
         right_statevector.arrange()
-        circuit_grid.draw(screen)
-        pygame.display.flip()
+        self.refresh_circuit_grid(screen, circuit_grid)
 
-    @staticmethod
-    def move_update_circuit_grid_display(screen, circuit_grid, direction):
+    def refresh_circuit_grid(self, screen, circuit_grid):
+        """
+        Show circuit grid changes, right away unless a renderer draws them
+        """
+        if self.renderer is None:
+            circuit_grid.draw(screen)
+            pygame.display.flip()
+
+    def move_update_circuit_grid_display(self, screen, circuit_grid, direction):
         """
         Update circuit grid after move
         """
         circuit_grid.move_to_adjacent_node(direction)
-        circuit_grid.draw(screen)
-        pygame.display.flip()
+        self.refresh_circuit_grid(screen, circuit_grid)
@@ -25,7 +25,7 @@ from qpong.containers.vbox import VBox
 from qpong.viz.statevector_grid import StatevectorGrid
 from qpong.controls.circuit_grid import CircuitGrid
 
-from qpong.utils.parameters import WIDTH_UNIT, CIRCUIT_DEPTH
+from qpong.utils.parameters import WIDTH_UNIT, CIRCUIT_DEPTH, QUBIT_NUM
 
 
 class Level:
@@ -33,12 +33,12 @@ class Level:
     Start up a level
     """
 
-    def __init__(self):
-        self.level = 3  # game level
+    def __init__(self, rng=None):
+        self.level = QUBIT_NUM  # game level
+        self.rng = rng  # seed or generator of measurements, for reproducible matches
         self.win = False  # flag for winning the game
         self.left_paddle = pygame.sprite.Sprite()
         self.right_paddle = pygame.sprite.Sprite()
-        self.circuit = None
         self.circuit_grid = None
         self.circuit_grid_model = None
         self.statevector_grid = None
@@ -51,8 +51,9 @@ class Level:
         scene.qubit_num = self.level
         self.circuit_grid_model = CircuitGridModel(scene.qubit_num, CIRCUIT_DEPTH)
 
-        self.circuit = self.circuit_grid_model.construct_circuit()
-        self.statevector_grid = StatevectorGrid(self.circuit, scene.qubit_num)
+        self.statevector_grid = StatevectorGrid(
+            self.circuit_grid_model, scene.qubit_num, rng=self.rng
+        )
         self.right_statevector = VBox(
             WIDTH_UNIT * 90, WIDTH_UNIT * 0, self.statevector_grid
         )
@@ -0,0 +1,308 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Batches of headless matches played in parallel, for difficulty balancing
+"""
+
+from collections import namedtuple
+from concurrent import futures
+import csv
+import json
+import multiprocessing
+import os
+import random
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.utils.headless import DIFFICULTIES, new_match
+from qpong.utils.parameters import (
+    CLASSICAL_COMPUTER,
+    QUANTUM_COMPUTER,
+    CLASSICAL_REACTION_TIME,
+    CLASSICAL_JITTER,
+    CLASSICAL_PADDLE_SPEED,
+    QUBIT_NUM,
+)
+
+# Game settings and quantum player strategy of a batch of matches
+MatchSetting = namedtuple(
+    "MatchSetting",
+    ["difficulty", "reaction_time", "jitter", "strategy", "paddle_speed"],
+    defaults=(CLASSICAL_PADDLE_SPEED,),
+)
+
+# Outcome of a match played to WIN_SCORE
+MatchResult = namedtuple(
+    "MatchResult", ["winner", "rally_lengths", "outcomes", "ticks"]
+)
+
+# physics ticks after which an undecided match is stopped
+MAX_MATCH_TICKS = 100000
+
+
+# strategies are only called through act, once per physics tick
+# pylint: disable=too-few-public-methods
+class IdleStrategy:
+    """
+    Quantum player leaving the circuit grid empty,
+    so the paddle is always measured at |0...0>
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def act(self, core):
+        """
+        Edit the circuit grid before a physics tick
+        """
+
+
+class HadamardStrategy(IdleStrategy):
+    """
+    Quantum player putting every wire in superposition once,
+    so the paddle is measured anywhere with equal probability
+    """
+
+    def act(self, core):
+        if core.timestep.ticks > 0:
+            return
+        circuit_grid = core.level.circuit_grid
+        for wire_num in range(core.level.circuit_grid_model.max_wires):
+            circuit_grid.highlight_selected_node(wire_num, 0)
+            circuit_grid.handle_input_h()
+
+
+class RandomStrategy(IdleStrategy):
+    """
+    Quantum player toggling a random X, Y, Z or H gate
+    in the first columns every half second
+    """
+
+    interval = 500
+    columns = 3
+
+    def act(self, core):
+        if core.timestep.ticks % (core.timestep.tick_rate * self.interval // 1000):
+            return
+        circuit_grid = core.level.circuit_grid
+        circuit_grid.highlight_selected_node(
+            self.rng.randrange(core.level.circuit_grid_model.max_wires),
+            self.rng.randrange(self.columns),
+        )
+        self.rng.choice(
+            (
+                circuit_grid.handle_input_x,
+                circuit_grid.handle_input_y,
+                circuit_grid.handle_input_z,
+                circuit_grid.handle_input_h,
+            )
+        )()
+
+
+class TrackingStrategy(IdleStrategy):
+    """
+    Quantum player preparing the basis state of the row the ball is
+    in while it approaches, with X gates in the first column, at the
+    reaction time of the classical paddle
+    """
+
+    def act(self, core):
+        ball = core.ball
+        interval = core.timestep.tick_rate * core.classical_ai.reaction_time // 1000
+        if not ball.heading_right() or core.timestep.ticks % max(interval, 1):
+            return
+
+        block_size = core.level.statevector_grid.block_size
+        max_wires = core.level.circuit_grid_model.max_wires
+        row = int((ball.get_ypos() + ball.height / 2) // block_size)
+        row = min(max(row, 0), 2**max_wires - 1)
+
+        circuit_grid = core.level.circuit_grid
+        for wire_num in range(max_wires):
+            circuit_grid.highlight_selected_node(wire_num, 0)
+            has_x = circuit_grid.get_selected_node_gate_part() == node_types.X
+            if has_x != bool(row >> wire_num & 1):
+                circuit_grid.handle_input_x()
+
+
+# pylint: enable=too-few-public-methods
+
+STRATEGIES = {
+    "idle": IdleStrategy,
+    "hadamard": HadamardStrategy,
+    "random": RandomStrategy,
+    "tracking": TrackingStrategy,
+}
+
+
+def play_match(setting, seed):
+    """
+    Play a headless match to WIN_SCORE
+
+    Parameters:
+    setting (MatchSetting): game settings and quantum player strategy
+    seed (integer): seed of the match
+
+    Returns:
+        MatchResult: outcome of the match
+    """
+    core = new_match(
+        seed,
+        DIFFICULTIES[setting.difficulty],
+        reaction_time=setting.reaction_time,
+        jitter=setting.jitter,
+        paddle_speed=setting.paddle_speed,
+    )
+    strategy = STRATEGIES[setting.strategy](random.Random(seed))
+
+    while core.winner() is None and core.timestep.ticks < MAX_MATCH_TICKS:
+        strategy.act(core)
+        core.tick()
+
+    return MatchResult(
+        core.winner(), core.rally_lengths, core.outcomes, core.timestep.ticks
+    )
+
+
+def match_seeds(seed, setting_num, matches):
+    """
+    Derive independent seeds of the matches of a setting, so that
+    results do not depend on how matches are spread over processes
+    """
+    return (
+        np.random.SeedSequence([seed, setting_num])
+        .generate_state(matches, dtype=np.uint32)
+        .tolist()
+    )
+
+
+def summarize(setting, results, num_outcomes):
+    """
+    Aggregate the results of a setting into a report row
+
+    Returns:
+        dict: win rates, rally lengths and measurement outcome distribution
+    """
+    winners = [result.winner for result in results]
+    rally_lengths = [length for result in results for length in result.rally_lengths]
+    outcomes = np.bincount(
+        [outcome for result in results for outcome in result.outcomes],
+        minlength=num_outcomes,
+    )
+    return {
+        "difficulty": setting.difficulty,
+        "reaction_time": setting.reaction_time,
+        "jitter": setting.jitter,
+        "paddle_speed": setting.paddle_speed,
+        "strategy": setting.strategy,
+        "matches": len(results),
+        "quantum_win_rate": winners.count(QUANTUM_COMPUTER) / len(results),
+        "classical_win_rate": winners.count(CLASSICAL_COMPUTER) / len(results),
+        "mean_rallies": len(rally_lengths) / len(results),
+        "mean_rally_ticks": float(np.mean(rally_lengths)) if rally_lengths else 0.0,
+        "max_rally_ticks": max(rally_lengths, default=0),
+        "outcome_distribution": (outcomes / max(outcomes.sum(), 1)).round(4).tolist(),
+    }
+
+
+def simulate(settings, matches, seed=0, processes=None):
+    """
+    Play matches of every setting in a process pool
+
+    Parameters:
+    settings (list): MatchSetting entries
+    matches (integer): matches per setting
+    seed (integer): seed of the whole batch, the report is the same for
+        the same seed whatever the number of processes
+    processes (integer): worker processes, the number of CPUs by default
+
+    Returns:
+        list: report row of each setting, see summarize
+    """
+    jobs = [
+        (setting, match_seed)
+        for setting_num, setting in enumerate(settings)
+        for match_seed in match_seeds(seed, setting_num, matches)
+    ]
+    processes = processes or os.cpu_count() or 1
+    # pygame is set up again in fresh processes rather than forked
+    with futures.ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = list(
+            executor.map(
+                play_match,
+                [job[0] for job in jobs],
+                [job[1] for job in jobs],
+                chunksize=max(1, len(jobs) // (4 * processes)),
+            )
+        )
+
+    # basis states the quantum paddle can be measured in
+    num_outcomes = 2**QUBIT_NUM
+
+    return [
+        summarize(
+            setting,
+            results[setting_num * matches : (setting_num + 1) * matches],
+            num_outcomes,
+        )
+        for setting_num, setting in enumerate(settings)
+    ]
+
+
+def settings_grid(
+    difficulties=tuple(DIFFICULTIES),
+    reaction_times=(CLASSICAL_REACTION_TIME,),
+    jitters=(CLASSICAL_JITTER,),
+    strategies=tuple(STRATEGIES),
+    paddle_speeds=(CLASSICAL_PADDLE_SPEED,),
+):
+    """
+    Get every combination of the given settings
+    """
+    return [
+        MatchSetting(difficulty, reaction_time, jitter, strategy, paddle_speed)
+        for difficulty in difficulties
+        for reaction_time in reaction_times
+        for jitter in jitters
+        for paddle_speed in paddle_speeds
+        for strategy in strategies
+    ]
+
+
+def write_report(rows, path):
+    """
+    Write report rows as CSV if the path ends with .csv, JSON otherwise
+    """
+    with open(path, "w", encoding="utf-8", newline="") as report_file:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(report_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(
+                    dict(
+                        row,
+                        outcome_distribution=" ".join(
+                            str(share) for share in row["outcome_distribution"]
+                        ),
+                    )
+                )
+        else:
+            json.dump(rows, report_file, indent=2)
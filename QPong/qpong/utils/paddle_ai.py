@@ -0,0 +1,129 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Classical computer paddle
+"""
+
+import random
+
+from qpong.utils.parameters import (
+    WIDTH_UNIT,
+    CLASSICAL_REACTION_TIME,
+    CLASSICAL_JITTER,
+    CLASSICAL_PADDLE_SPEED,
+)
+from qpong.utils.trajectory import predict_crossing
+
+
+class ClassicalPaddleAI:
+    """
+    Moves the classical paddle to where the ball will cross it. The
+    crossing is predicted once when the ball bounces off a paddle or
+    is reset, and the paddle moves there at a limited speed after
+    a reaction time, missing it by a random error.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        paddle,
+        ball,
+        reaction_time=CLASSICAL_REACTION_TIME,
+        error=CLASSICAL_JITTER,
+        speed=CLASSICAL_PADDLE_SPEED,
+    ):
+        """
+        Parameters:
+        paddle (pygame.sprite.Sprite): classical paddle, on the left
+        ball (Ball): the ball
+        reaction_time (integer): time (in milliseconds) before the paddle
+            starts moving after the ball changed course
+        error (float): largest distance (in WIDTH_UNIT) the paddle aims
+            away from the ball
+        speed (float): largest paddle move per physics tick (in WIDTH_UNIT)
+        """
+        self.paddle = paddle
+        self.ball = ball
+        self.reaction_time = reaction_time
+        self.error = error
+        self.speed = speed
+
+        # paddle top the paddle moves to, and when it may start moving
+        self.target = paddle.rect.y
+        self.react_time = None
+        self._course_changed = False
+        # paddle top where moving towards the target no longer changes it
+        self._settled_y = None
+        # number of predictions made
+        self.predictions = 0
+
+        ball.subscribe(self.on_course_change)
+        self.on_course_change(ball)
+
+    def on_course_change(self, ball):
+        """
+        Predict where the paddle has to go, after a bounce or reset
+        """
+        paddle_rect = self.paddle.rect
+        crossing = predict_crossing(
+            ball.xpos,
+            ball.ypos,
+            ball.direction,
+            paddle_rect.right,
+            ball.top_edge,
+            ball.bottom_edge - ball.height,
+        )
+        if crossing is None:
+            # the ball goes to the quantum paddle, wait in the middle
+            crossing = (ball.top_edge + ball.bottom_edge - ball.height) / 2
+        else:
+            error = round(WIDTH_UNIT * self.error)
+            crossing += random.randint(-error, error)
+
+        self.target = crossing + ball.height / 2 - paddle_rect.height / 2
+        self._course_changed = True
+        self._settled_y = None
+        self.predictions += 1
+
+    def update(self, time):
+        """
+        Move the paddle towards its target by one physics tick
+
+        Parameters:
+        time (integer): physics time (in milliseconds)
+        """
+        if self._course_changed:
+            self.react_time = time + self.reaction_time
+            self._course_changed = False
+        if self.react_time is None or time < self.react_time or self.settled:
+            return
+
+        paddle_rect = self.paddle.rect
+        max_step = self.speed * WIDTH_UNIT
+        step = min(max(self.target - paddle_rect.y, -max_step), max_step)
+        ypos = round(paddle_rect.y + step)
+        if ypos == paddle_rect.y:
+            self._settled_y = ypos
+        paddle_rect.y = ypos
+
+    @property
+    def settled(self):
+        """
+        Check if the paddle stays where it is until the ball changes course
+        """
+        return not self._course_changed and self.paddle.rect.y == self._settled_y
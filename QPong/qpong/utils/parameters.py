@@ -35,11 +35,16 @@ WINDOW_HEIGHT = 750
 
 WIDTH_UNIT = round(WINDOW_WIDTH / 100)
 WINDOW_SIZE = WINDOW_WIDTH, WINDOW_HEIGHT
-QUBIT_NUM = 2
+QUBIT_NUM = 3
 CIRCUIT_DEPTH = 18
 
 WIN_SCORE = 7
 
+# Physics ticks per second, ball speed is in pixels per tick
+TICK_RATE = 60
+# Longest frame time (in seconds) caught up with physics ticks
+MAX_FRAME_TIME = 0.25
+
 # For ball.py
 LEFT = 0
 RIGHT = 1
@@ -68,6 +73,16 @@ EASY = 0.3
 NORMAL = 0.6
 EXPERT = 1.5
 
+# Classical paddle reaction time (in milliseconds) to a change of the ball
+# course, aim error (in WIDTH_UNIT) and speed (in WIDTH_UNIT per tick)
+CLASSICAL_REACTION_TIME = 300
+CLASSICAL_JITTER = 4
+CLASSICAL_PADDLE_SPEED = 1
+
+# Time (in milliseconds) without grid edits after which the grid counts as
+# frozen, and the outcome of the next measurement is drawn ahead of time
+EDIT_WINDOW = 200
+
 # EASY = NORMAL = EXPERT = 0.6
 
 # For input.py
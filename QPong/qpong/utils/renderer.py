@@ -0,0 +1,119 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Dirty rectangle rendering of the game screen
+"""
+
+import pygame
+
+from qpong.utils.scene import SCORE_AREA
+
+
+class DirtyRectRenderer:
+    """
+    Keeps the static layers of the screen (dashed line, scores, statevector
+    grid, circuit grid) on a background surface, and only sends the screen
+    areas that changed to the display: the moving sprites every frame, and
+    the background areas invalidated since the previous frame.
+    """
+
+    def __init__(self, screen, draw_background):
+        """
+        Parameters:
+        screen (pygame.Surface): display surface
+        draw_background (callable): draws the static layers on a surface
+        """
+        self.screen = screen
+        self.draw_background = draw_background
+        self.background = pygame.Surface(screen.get_size())
+        self.moving_sprites = pygame.sprite.RenderUpdates()
+        self._dirty_rects = []
+        self._full_redraw = True
+        # number of display areas updated by the last render, 0 for a full redraw
+        self.updated_rects = 0
+
+    def add(self, *sprites):
+        """
+        Add sprites that move every frame
+        """
+        self.moving_sprites.add(*sprites)
+
+    def invalidate(self, rect=None):
+        """
+        Mark an area of the static layers as changed
+
+        Parameters:
+        rect (pygame.Rect): changed area, or None for the whole screen
+        """
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def render(self):
+        """
+        Draw changed areas and moving sprites, and update them on the display
+        """
+        if self._full_redraw:
+            self.draw_background(self.background)
+        elif self._dirty_rects:
+            # only the changed areas of the background are drawn again
+            self.background.set_clip(self._dirty_rects[0].unionall(self._dirty_rects))
+            self.draw_background(self.background)
+            self.background.set_clip(None)
+
+        if self._full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.moving_sprites.draw(self.screen)
+            pygame.display.flip()
+            self.updated_rects = 0
+        else:
+            self.moving_sprites.clear(self.screen, self.background)
+            for rect in self._dirty_rects:
+                self.screen.blit(self.background, rect, rect)
+            rects = self._dirty_rects + self.moving_sprites.draw(self.screen)
+            pygame.display.update(rects)
+            self.updated_rects = len(rects)
+
+        self._dirty_rects = []
+        self._full_redraw = False
+
+
+def draw_static_layers(surface, scene, level, ball):
+    """
+    Draw the parts of the screen that only change on game events
+    """
+    # dashed line, player labels and circuit grid background
+    scene.draw_background(surface, ball, level.circuit_grid)
+    scene.score_digits(surface, ball)  # print score
+    # draw right paddle together with statevector grid
+    level.right_statevector.draw(surface)
+    level.circuit_grid.draw_gates(surface)  # draw circuit grid
+
+
+def invalidate_changed_layers(renderer, level, ball):
+    """
+    Pass the areas of static layers changed during the frame to the renderer
+    """
+    if ball.score.dirty:
+        renderer.invalidate(SCORE_AREA)
+        ball.score.dirty = False
+    if level.statevector_grid.dirty:
+        renderer.invalidate(level.statevector_grid.rect)
+        level.statevector_grid.dirty = False
+    for rect in level.circuit_grid.pop_dirty_rects():
+        renderer.invalidate(rect)
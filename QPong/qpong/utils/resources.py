@@ -21,6 +21,7 @@ Utilities for loading resources (fonts, images and sounds)
 import os
 
 import pygame
+from qpong.utils import parameters
 from qpong.utils.parameters import WIDTH_UNIT
 
 main_dir = os.path.split(os.path.abspath(__file__))[0]
@@ -55,6 +56,205 @@ def load_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
     return image, image.get_rect()
 
 
+class ImageCache:
+    """
+    Process-wide cache of images loaded with load_image, keyed by
+    (name, scale, colorkey). The cached surfaces are shared, so they must
+    be copied before drawing on them. The cache is emptied when the display
+    mode or WIDTH_UNIT changes, and when pygame quits.
+    """
+
+    # atlas rows are filled up to this width
+    ATLAS_WIDTH = 1024
+
+    def __init__(self):
+        self._images = {}
+        self._display_key = None
+        self._width_unit = None
+        self._quit_registered = False
+        self.atlas = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_display(self):
+        """
+        Empty the cache if the display mode or WIDTH_UNIT changed
+        """
+        if not self._quit_registered:
+            pygame.register_quit(self._on_quit)
+            self._quit_registered = True
+
+        display = pygame.display.get_surface()
+        display_key = (
+            None
+            if display is None
+            else (id(display), display.get_size(), display.get_bitsize())
+        )
+        if (display_key, parameters.WIDTH_UNIT) != (
+            self._display_key,
+            self._width_unit,
+        ):
+            self.invalidate()
+            self._display_key = display_key
+            self._width_unit = parameters.WIDTH_UNIT
+
+    def get(self, name, colorkey=None, scale=None):
+        """
+        Get a loaded image
+
+        Parameters:
+        name (string): file name
+        colorkey: as for load_image
+        scale (float): as for load_image, WIDTH_UNIT / 13 by default
+
+        Returns:
+            tuple: shared image and a new rect of its size
+        """
+        self._check_display()
+        if scale is None:
+            scale = parameters.WIDTH_UNIT / 13
+        key = (name, scale, colorkey)
+
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image, _ = load_image(name, colorkey, scale)
+            self._images[key] = image
+        else:
+            self.hits += 1
+        return image, image.get_rect()
+
+    def warm_up(self, names=None, colorkey=-1, scale=None, atlas=False):
+        """
+        Load images ahead of their first use
+
+        Parameters:
+        names (list): file names, all gate and cursor images by default
+        colorkey: as for load_image
+        scale (float): as for load_image
+        atlas (boolean): also pack the cached images into one atlas surface
+        """
+        if names is None:
+            names = [
+                os.path.join(directory, file_name)
+                for directory in ("gate_images", "cursor_images")
+                for file_name in sorted(
+                    os.listdir(os.path.join(data_dir, "images", directory))
+                )
+                if file_name.endswith(".png")
+            ]
+        for name in names:
+            self.get(name, colorkey, scale)
+        if atlas:
+            self.build_atlas()
+
+    def _pack_atlas(self):
+        """
+        Place the cached images in rows sorted by height
+
+        Returns:
+            dict: cache key -> rectangle of the image in the atlas
+        """
+        keys = sorted(self._images, key=lambda key: -self._images[key].get_height())
+        positions = {}
+        xpos = ypos = row_height = 0
+        for key in keys:
+            width, height = self._images[key].get_size()
+            if xpos + width > self.ATLAS_WIDTH and xpos > 0:
+                xpos, ypos, row_height = 0, ypos + row_height, 0
+            positions[key] = pygame.Rect(xpos, ypos, width, height)
+            xpos += width
+            row_height = max(row_height, height)
+        return positions
+
+    def build_atlas(self):
+        """
+        Pack the cached images into one surface, in rows sorted by height.
+        Cached images are replaced by subsurfaces of the atlas.
+        """
+        positions = self._pack_atlas()
+        atlas = pygame.Surface(
+            (
+                max((rect.right for rect in positions.values()), default=0),
+                max((rect.bottom for rect in positions.values()), default=0),
+            )
+        )
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert()
+
+        for key, rect in positions.items():
+            image = self._images[key]
+            colorkey = image.get_colorkey()
+            # copy pixels as they are, including the ones matching the colorkey
+            pixels = image.copy()
+            pixels.set_colorkey(None)
+            atlas.blit(pixels, rect)
+            subsurface = atlas.subsurface(rect)
+            if colorkey is not None:
+                subsurface.set_colorkey(colorkey, pygame.RLEACCEL)
+            self._images[key] = subsurface
+        self.atlas = atlas
+
+    def memory_report(self):
+        """
+        Get the number of cached images and an estimate of their pixel memory
+
+        Returns:
+            dict: counts and sizes in bytes
+        """
+        if self.atlas is not None:
+            atlas_bytes = (
+                self.atlas.get_width()
+                * self.atlas.get_height()
+                * self.atlas.get_bytesize()
+            )
+        else:
+            atlas_bytes = 0
+        image_bytes = sum(
+            image.get_width() * image.get_height() * image.get_bytesize()
+            for image in self._images.values()
+            if image.get_parent() is None
+        )
+        return {
+            "images": len(self._images),
+            "image_bytes": image_bytes,
+            "atlas_bytes": atlas_bytes,
+            "total_bytes": image_bytes + atlas_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _on_quit(self):
+        """
+        Drop images of the pygame session that ended, pygame
+        forgets quit callbacks once they are called
+        """
+        self._quit_registered = False
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drop all cached images and the atlas
+        """
+        self._images.clear()
+        self.atlas = None
+        self._display_key = None
+
+
+image_cache = ImageCache()
+
+
+def load_cached_image(name, colorkey=None, scale=None):
+    """
+    Load image through the process-wide image cache. The returned
+    image is shared and must be copied before drawing on it.
+
+    Parameters:
+    name (string): file name
+    """
+    return image_cache.get(name, colorkey, scale)
+
+
 def load_sound(name):
     """
     Load sound with pygame mixer
@@ -29,11 +29,15 @@ from qpong.utils.parameters import (
     EASY,
     NORMAL,
     EXPERT,
+    QUBIT_NUM,
 )
 from qpong.utils.colors import WHITE, BLACK, GRAY
 from qpong.utils import gamepad
 from qpong.utils.font import Font
 
+# screen area of the player names and scores
+SCORE_AREA = pygame.Rect(0, 0, WINDOW_WIDTH, 15 * WIDTH_UNIT)
+
 
 class Scene:
     """
@@ -45,9 +49,15 @@ class Scene:
 
         self.begin = False
         self.restart = False
-        self.qubit_num = 3
+        self.qubit_num = QUBIT_NUM
         self.font = Font()
 
+        # static layer of the playing screen and what it was composed for
+        self._background = None
+        self._background_key = None
+        # rendered score digits of each player, with the score they show
+        self._score_digits = {}
+
     def start(self, screen, ball):
         # pylint: disable=too-many-branches disable=too-many-return-statements
         """
@@ -188,11 +198,30 @@ class Scene:
                 0,
             )
 
-    def score(self, screen, ball):
+    def draw_background(self, screen, ball, circuit_grid=None):
         """
-        Show score for both player
+        Draw the static layer of the playing screen, composed once from the
+        dashed line, the player labels and the circuit grid background
+
+        Parameters:
+        circuit_grid (CircuitGrid): circuit grid whose background is included
+        """
+        key = (screen.get_size(), ball.screenheight, circuit_grid)
+        if self._background_key != key:
+            self._background = pygame.Surface(screen.get_size())
+            self._background.fill(BLACK)
+            self.dashed_line(self._background, ball)
+            self.player_labels(self._background)
+            if circuit_grid is not None:
+                grid_background = circuit_grid.circuit_grid_background
+                self._background.blit(grid_background.image, grid_background.rect)
+            self._background_key = key
+        screen.blit(self._background, (0, 0))
+
+    def player_labels(self, screen):
+        """
+        Show player names above the scores
         """
-        # Print the score
         text = self.font.player_font.render("Classical Computer", 1, GRAY)
         text_pos = text.get_rect(
             center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 1.5)
@@ -205,19 +234,29 @@ class Scene:
         )
         screen.blit(text, text_pos)
 
-        score_print = str(ball.check_score(0))
-        text = self.font.score_font.render(score_print, 1, GRAY)
-        text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
-        )
-        screen.blit(text, text_pos)
+    def score_digits(self, screen, ball):
+        """
+        Show score digits of both players, rendered again only
+        when a score changed
+        """
+        for player, xpos in (
+            (CLASSICAL_COMPUTER, round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5),
+            (QUANTUM_COMPUTER, round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5),
+        ):
+            score = ball.check_score(player)
+            cached = self._score_digits.get(player)
+            if cached is None or cached[0] != score:
+                text = self.font.score_font.render(str(score), 1, GRAY)
+                text_pos = text.get_rect(center=(xpos, WIDTH_UNIT * 8))
+                cached = self._score_digits[player] = (score, text, text_pos)
+            screen.blit(cached[1], cached[2])
 
-        score_print = str(ball.check_score(1))
-        text = self.font.score_font.render(score_print, 1, GRAY)
-        text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
-        )
-        screen.blit(text, text_pos)
+    def score(self, screen, ball):
+        """
+        Show score for both player
+        """
+        self.player_labels(screen)
+        self.score_digits(screen, ball)
 
     def credits(self, screen):
         """
@@ -30,6 +30,8 @@ class Score(pygame.sprite.Sprite):
 
         self.player = 0
         self.computer = 0
+        # set when the score changed and has to be redrawn
+        self.dirty = True
 
     # Computer = 0, Player = 1
     def update(self, player):
@@ -45,6 +47,8 @@ class Score(pygame.sprite.Sprite):
         if player == 1:
             self.player += 1
 
+        self.dirty = True
+
     def get_score(self, player):
         """
         Get score for a specified player
@@ -62,3 +66,4 @@ class Score(pygame.sprite.Sprite):
         """
         self.computer = 0
         self.player = 0
+        self.dirty = True
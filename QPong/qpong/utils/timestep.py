@@ -0,0 +1,94 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Fixed timestep clock for the game physics
+"""
+
+from qpong.utils.parameters import TICK_RATE, MAX_FRAME_TIME
+
+
+class FixedTimestep:
+    """
+    Accumulates real frame time and converts it into a whole number of
+    fixed physics ticks, so that the game advances the same way whatever
+    the frame rate. The fraction of a tick left over is used to
+    interpolate what is rendered between the last two physics states.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_frame_time=MAX_FRAME_TIME):
+        """
+        Parameters:
+        tick_rate (integer): physics ticks per second
+        max_frame_time (float): longest frame time (in seconds) caught up,
+            so that a stalled frame does not trigger a burst of ticks
+        """
+        self.tick_rate = tick_rate
+        # duration of a physics tick (in seconds)
+        self.tick_time = 1 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        # physics ticks run since the start
+        self.ticks = 0
+
+    def advance(self, frame_time):
+        """
+        Add the time taken by a frame
+
+        Parameters:
+        frame_time (float): real time since the previous frame (in seconds)
+
+        Returns:
+            integer: number of physics ticks to run for the frame
+        """
+        self.accumulator += min(frame_time, self.max_frame_time)
+        ticks = int(self.accumulator // self.tick_time)
+        self.accumulator -= ticks * self.tick_time
+        return ticks
+
+    def step(self, ticks=1):
+        """
+        Count physics ticks as run
+        """
+        self.ticks += ticks
+
+    def ticks_until(self, time):
+        """
+        Count the physics ticks still to run before the physics time
+        passes a time (in milliseconds)
+        """
+        return max(0, ((time + 1) * self.tick_rate - 1) // 1000 - self.ticks)
+
+    def reset(self):
+        """
+        Drop the accumulated time, e.g. after a blocking screen
+        """
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self):
+        """
+        Fraction of a tick between the last physics state and the next one
+        """
+        return self.accumulator / self.tick_time
+
+    @property
+    def time(self):
+        """
+        Get the physics time since the start (in milliseconds)
+        """
+        return self.ticks * 1000 // self.tick_rate
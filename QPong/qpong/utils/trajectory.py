@@ -0,0 +1,63 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Closed form prediction of the ball trajectory
+"""
+
+import math
+
+
+def fold(position, low, high):
+    """
+    Map a position on an unbounded line back between two mirrors,
+    as if it had been reflected by them
+
+    Parameters:
+    position (float): position without reflections
+    low (float): lower mirror
+    high (float): upper mirror
+    """
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (position - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+
+def predict_crossing(xpos, ypos, direction, target_x, top, bottom):
+    """
+    Predict where a ball moving in a straight line, reflected off the
+    top and bottom edges, reaches a vertical line
+
+    Parameters:
+    xpos (float): horizontal position of the ball
+    ypos (float): vertical position of the ball
+    direction (float): heading of the ball in degrees, as Ball.direction
+    target_x (float): horizontal position of the line
+    top (float): smallest vertical position of the ball
+    bottom (float): largest vertical position of the ball
+
+    Returns:
+        float: vertical position of the ball on the line, or None if
+            the ball moves away from it or parallel to it
+    """
+    radians = math.radians(direction)
+    step_x = math.sin(radians)
+    if abs(step_x) < 1e-12 or (target_x - xpos) * step_x < 0:
+        return None
+    return fold(ypos - math.cos(radians) * (target_x - xpos) / step_x, top, bottom)
@@ -18,10 +18,11 @@
 Statevector grid for quantum player
 """
 
+import numpy as np
 import pygame
 
-from qiskit.quantum_info import Statevector
-
+from qpong.model.measurement_sampler import MeasurementSampler
+from qpong.model.stabilizer_simulator import sample_circuit_grid
 from qpong.utils.colors import WHITE, BLACK
 from qpong.utils.parameters import WIDTH_UNIT
 from qpong.utils.states import comp_basis_states
@@ -29,75 +30,210 @@ from qpong.utils.ball import Ball
 from qpong.utils.font import Font
 
 
+# pylint: disable=too-few-public-methods
+class PaintedCells:
+    """
+    What is painted on the statevector grid image
+    """
+
+    def __init__(self):
+        # number of qubits whose basis state labels are painted
+        self.qubit_num = None
+        # alpha value painted in the paddle cell of each basis state
+        self.alphas = None
+
+
 class StatevectorGrid(pygame.sprite.Sprite):
     """
-    Displays a statevector grid
+    Displays a statevector grid. The image is kept between refreshes, and
+    only the paddle cells whose alpha value changed are painted again.
     """
 
-    def __init__(self, circuit, qubit_num):
+    def __init__(self, circuit_grid_model, qubit_num, simulator=None, rng=None):
         pygame.sprite.Sprite.__init__(self)
-        self.image = None
-        self.rect = None
         self.ball = Ball()
         self.font = Font()
         self.block_size = int(round(self.ball.screenheight / 2**qubit_num))
-        self.basis_states = comp_basis_states(circuit.width())
-        self.circuit = circuit
+        self.basis_states = comp_basis_states(circuit_grid_model.max_wires)
+        self.circuit_grid_model = circuit_grid_model
+        self.simulator = simulator
+        self.sampler = MeasurementSampler(rng)
+        # (model revision, outcome) drawn ahead of the next measurement
+        self.premeasurement = None
+
+        self.image = pygame.Surface(
+            [
+                (self.circuit_grid_model.max_wires + 1) * 3 * WIDTH_UNIT,
+                self.ball.screenheight,
+            ]
+        ).convert()
+        self.rect = self.image.get_rect()
+        # set when the image changed and has to be redrawn
+        self.dirty = True
+        # qubit number -> transparent surface with the basis state labels
+        self._label_layers = {}
+        self._painted = PaintedCells()
 
         self.paddle = pygame.Surface([WIDTH_UNIT, self.block_size])
         self.paddle.fill(WHITE)
         self.paddle.convert()
 
-        self.paddle_before_measurement(circuit, qubit_num)
+        self.update()
+        self.paddle_before_measurement(circuit_grid_model, qubit_num)
+
+    def label_layer(self, qubit_num):
+        """
+        Get the computational basis labels for a statevector of a specified
+        number of qubits, rendered once per number of qubits
+        """
+        layer = self._label_layers.get(qubit_num)
+        if layer is None:
+            layer = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
+            for qb_idx in range(2**qubit_num):
+                text = self.font.vector_font.render(
+                    "|" + self.basis_states[qb_idx] + ">", 1, WHITE
+                )
+                text_height = text.get_height()
+                y_offset = self.block_size * 0.5 - text_height * 0.5
+                layer.blit(text, (2 * WIDTH_UNIT, qb_idx * self.block_size + y_offset))
+            self._label_layers[qubit_num] = layer
+        return layer
 
     def display_statevector(self, qubit_num):
         """
         Draw computational basis for a statevector of a specified
-        number of qubits
+        number of qubits, unless it is already displayed
         """
-        for qb_idx in range(2**qubit_num):
-            text = self.font.vector_font.render(
-                "|" + self.basis_states[qb_idx] + ">", 1, WHITE
-            )
-            text_height = text.get_height()
-            y_offset = self.block_size * 0.5 - text_height * 0.5
-            self.image.blit(text, (2 * WIDTH_UNIT, qb_idx * self.block_size + y_offset))
+        if qubit_num == self._painted.qubit_num:
+            return
+        self.update()
+        self.image.blit(self.label_layer(qubit_num), (0, 0))
+        self._painted.qubit_num = qubit_num
 
-    def paddle_before_measurement(self, circuit, qubit_num):
+    def paint_paddle(self, alphas):
+        """
+        Set the alpha value of the paddle cell of each basis state,
+        painting only the cells whose value changed
+
+        Parameters:
+        alphas (ndarray): alpha value (0-255) of each basis state
+        """
+        painted = self._painted
+        if painted.alphas is None or len(painted.alphas) != len(alphas):
+            painted.alphas = np.zeros(len(alphas), dtype=int)
+        for basis_state in np.flatnonzero(alphas != painted.alphas):
+            cell = (0, basis_state * self.block_size)
+            self.image.fill(BLACK, self.paddle.get_rect(topleft=cell))
+            self.paddle.set_alpha(int(alphas[basis_state]))
+            self.image.blit(self.paddle, cell)
+            painted.alphas[basis_state] = alphas[basis_state]
+            self.dirty = True
+
+    def probabilities(self, circuit_grid_model):
         """
-        Get statevector from circuit, and set the
+        Get basis state probabilities, from the statevectors cached by the
+        circuit grid model unless another simulator was given
+        """
+        if self.simulator is None:
+            return circuit_grid_model.get_probabilities()
+        return self.simulator.probabilities(circuit_grid_model)
+
+    def sample(self, circuit_grid_model):
+        """
+        Draw a measurement outcome of all qubits, on a stabilizer tableau
+        for large Clifford-only grids unless another simulator was given
+        """
+        if self.simulator is None:
+            return sample_circuit_grid(circuit_grid_model, sampler=self.sampler)
+        return self.sampler.sample(self.simulator.probabilities(circuit_grid_model))
+
+    def paddle_before_measurement(
+        self, circuit_grid_model, qubit_num, probabilities=None
+    ):
+        """
+        Simulate the circuit grid, and set the
         paddle(s) alpha values according to basis
         state(s) probabilitie(s)
+
+        Parameters:
+        probabilities (ndarray): probabilities already simulated, e.g. by
+            a SimulationWorker, instead of simulating the circuit grid
         """
-        self.update()
         self.display_statevector(qubit_num)
-        quantum_state = Statevector(circuit)
+        if probabilities is None:
+            probabilities = self.probabilities(circuit_grid_model)
 
-        for basis_state, ampl in enumerate(quantum_state):
-            self.paddle.set_alpha(int(round(abs(ampl) ** 2 * 255)))
-            self.image.blit(self.paddle, (0, basis_state * self.block_size))
+        self.paint_paddle(np.rint(np.asarray(probabilities) * 255).astype(int))
 
-    def paddle_after_measurement(self, circuit, qubit_num):
+    def premeasure(self, circuit_grid_model, probabilities=None):
         """
-        Measure all qubits on circuit
+        Draw the outcome of the next measurement ahead of time, for the
+        current revision of the circuit grid model. Nothing is done
+        if an outcome was already drawn for that revision.
+
+        Parameters:
+        probabilities (ndarray): probabilities already simulated, e.g. by
+            a SimulationWorker, instead of simulating the circuit grid
+        """
+        if not self.premeasured(circuit_grid_model):
+            self.premeasurement = (
+                circuit_grid_model.revision,
+                self.draw(circuit_grid_model, probabilities),
+            )
+
+    def premeasured(self, circuit_grid_model):
+        """
+        Check if the outcome of the next measurement of the current
+        revision of the circuit grid model is already drawn
+        """
+        return (
+            self.premeasurement is not None
+            and self.premeasurement[0] == circuit_grid_model.revision
+        )
+
+    def draw(self, circuit_grid_model, probabilities=None):
+        """
+        Draw a measurement outcome, from the given probabilities if any
+        """
+        if probabilities is None:
+            return self.sample(circuit_grid_model)
+        return self.sampler.sample(probabilities)
+
+    def measure(self, circuit_grid_model, probabilities=None):
+        """
+        Measure all qubits on circuit grid, taking the outcome drawn by
+        premeasure unless the grid was edited since
+        """
+        premeasured = self.premeasured(circuit_grid_model)
+        premeasurement, self.premeasurement = self.premeasurement, None
+        if premeasured:
+            return premeasurement[1]
+        return self.draw(circuit_grid_model, probabilities)
+
+    def paddle_after_measurement(
+        self, circuit_grid_model, qubit_num, probabilities=None
+    ):
+        """
+        Measure all qubits on circuit grid
+
+        Parameters:
+        probabilities (ndarray): probabilities already simulated, used
+            when no outcome was drawn ahead of time
         """
-        self.update()
         self.display_statevector(qubit_num)
-        measurement_bitstring = Statevector(circuit).sample_memory(1)[0]
-        measurement_int = int(measurement_bitstring, 2)
+        measurement_int = self.measure(circuit_grid_model, probabilities)
 
-        self.paddle.set_alpha(255)
-        self.image.blit(self.paddle, (0, measurement_int * self.block_size))
+        alphas = np.zeros(len(self.basis_states), dtype=int)
+        alphas[measurement_int] = 255
+        self.paint_paddle(alphas)
 
         return measurement_int
 
     def update(self):
         """
-        Update statevector grid
+        Clear the statevector grid, so that labels and paddle
+        cells are all painted again by the next refresh
         """
-        self.image = pygame.Surface(
-            [(self.circuit.width() + 1) * 3 * WIDTH_UNIT, self.ball.screenheight]
-        )
-        self.image.convert()
         self.image.fill(BLACK)
-        self.rect = self.image.get_rect()
+        self._painted = PaintedCells()
+        self.dirty = True
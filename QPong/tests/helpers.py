@@ -0,0 +1,104 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Shared helpers of the unit tests
+"""
+
+import numpy as np
+import pygame
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model.stabilizer_simulator import (
+    CONTROLLED_CLIFFORD_GATES,
+    SINGLE_QUBIT_CLIFFORD_GATES,
+)
+from qpong.model.circuit_optimizer import ROTATION_GATES
+from qpong.model.statevector_simulator import SIMULATED_NODE_TYPES
+from qpong.utils.parameters import WINDOW_SIZE
+
+SINGLE_QUBIT_GATES = tuple(int(node_type) for node_type in SIMULATED_NODE_TYPES)
+
+CONTROLLED_GATES = (node_types.X, node_types.Y, node_types.Z, node_types.H)
+
+
+def init_display():
+    """
+    Initialize pygame and open a window of the game size
+    """
+    pygame.init()
+
+    flags = pygame.DOUBLEBUF | pygame.HWSURFACE
+    return pygame.display.set_mode(WINDOW_SIZE, flags)
+
+
+def random_grid_model(
+    rng,
+    max_wires=3,
+    max_columns=6,
+    single_qubit_gates=SINGLE_QUBIT_GATES,
+    controlled_gates=CONTROLLED_GATES,
+    rotation_gates=ROTATION_GATES,
+):
+    """
+    Build a circuit grid model with a random gate on every column: a single
+    qubit gate, a rotation, a controlled gate or a swap
+
+    Parameters:
+    rng (numpy.random.Generator): source of the random gates
+    single_qubit_gates (tuple): node types of the single qubit gates
+    controlled_gates (tuple): node types of the controlled gates
+    rotation_gates (tuple): node types of the rotations, empty for none
+    """
+    model = CircuitGridModel(max_wires, max_columns)
+    kinds = ["single", "controlled", "swap"] + (["rotation"] if rotation_gates else [])
+    for column_num in range(max_columns):
+        wire_num = int(rng.integers(max_wires))
+        kind = kinds[rng.integers(len(kinds))]
+        if kind == "single":
+            node = CircuitGridNode(
+                single_qubit_gates[rng.integers(len(single_qubit_gates))]
+            )
+        elif kind == "rotation":
+            node = CircuitGridNode(
+                rotation_gates[rng.integers(len(rotation_gates))],
+                radians=np.pi / 8 * rng.integers(1, 16),
+            )
+        elif kind == "controlled":
+            ctrl_a = (wire_num + 1 + int(rng.integers(max_wires - 1))) % max_wires
+            node = CircuitGridNode(
+                controlled_gates[rng.integers(len(controlled_gates))], ctrl_a=ctrl_a
+            )
+        else:
+            node = CircuitGridNode(node_types.SWAP, swap=(wire_num + 1) % max_wires)
+        model.set_node(wire_num, column_num, node)
+    return model
+
+
+def random_clifford_grid_model(rng, max_wires=4, max_columns=10):
+    """
+    Build a circuit grid model with a random Clifford gate on every column
+    """
+    return random_grid_model(
+        rng,
+        max_wires,
+        max_columns,
+        single_qubit_gates=SINGLE_QUBIT_CLIFFORD_GATES,
+        controlled_gates=CONTROLLED_CLIFFORD_GATES,
+        rotation_gates=(),
+    )
@@ -19,14 +19,19 @@ Test ball
 
 import unittest
 
+import pygame
+
 from qpong.utils.ball import Ball
+from qpong.utils.trajectory import fold
 
 from qpong.utils.parameters import (
     LEFT,
     RIGHT,
     NOTHING,
     NO,
+    MEASURE_RIGHT,
     WINDOW_HEIGHT,
+    WIDTH_UNIT,
 )
 
 
@@ -68,3 +73,93 @@ class TestBall(unittest.TestCase):
         )
         self.assertEqual(self.ball.ypos, 0.7 * WINDOW_HEIGHT / 2)
         self.assertEqual(self.ball.reset_position, LEFT)
+
+    def test_heading_right(self):
+        """
+        Test ball direction towards the quantum player
+        """
+
+        self.ball.direction = 60
+        self.assertTrue(self.ball.heading_right())
+
+        self.ball.direction = (360 - self.ball.direction) % 360
+        self.assertFalse(self.ball.heading_right())
+
+    def test_interpolate(self):
+        """
+        Test ball rect placed between the last two physics positions
+        """
+
+        self.ball.direction = 90
+        self.ball.speed = 10
+        self.ball.update()
+
+        self.ball.interpolate(0.5)
+        self.assertEqual(self.ball.rect.x, int(self.ball.xpos - 5))
+
+        self.ball.interpolate(1)
+        self.assertEqual(self.ball.rect.x, int(self.ball.xpos))
+
+    def test_fast_ball_bounces_off_paddle(self):
+        """
+        Test that a ball faster than a paddle width per tick does not
+        pass through the paddle
+        """
+
+        paddle = pygame.Rect(self.ball.right_edge - 9 * WIDTH_UNIT, 0, WIDTH_UNIT, 500)
+        self.ball.xpos = paddle.x - 20 * WIDTH_UNIT
+        self.ball.ypos = 100
+        self.ball.direction = 90
+        self.ball.speed = 30 * WIDTH_UNIT
+
+        while not self.ball.update([paddle]):
+            self.ball.action()
+        self.ball.action()
+
+        self.assertLess(self.ball.xpos + self.ball.width, paddle.x)
+        self.assertEqual(self.ball.direction, 270)
+        self.assertAlmostEqual(self.ball.speed, 33 * WIDTH_UNIT)
+
+    def test_many_bounces_in_one_tick(self):
+        """
+        Test that a tick with many bounces is moved in full and
+        leaves the ball between the edges
+        """
+
+        self.ball.xpos = self.ball.screenwidth / 2
+        self.ball.ypos = 100
+        self.ball.direction = 180
+        self.ball.speed = 20.5 * self.ball.screenheight
+
+        self.assertTrue(self.ball.update())
+        self.assertEqual(self.ball.tick_left, 0)
+        bottom = self.ball.bottom_edge - self.ball.height
+        self.assertGreaterEqual(self.ball.ypos, self.ball.top_edge)
+        self.assertLessEqual(self.ball.ypos, bottom)
+        self.assertAlmostEqual(
+            self.ball.ypos,
+            fold(100 + self.ball.speed, self.ball.top_edge, bottom),
+            places=3,
+        )
+        self.assertAlmostEqual(self.ball.xpos, self.ball.screenwidth / 2)
+
+    def test_measurement_zone_entry(self):
+        """
+        Test that the ball stops in the measurement zone it enters,
+        whatever its speed
+        """
+
+        self.ball.xpos = self.ball.right_measure_start - 5 * WIDTH_UNIT
+        self.ball.ypos = 100
+        self.ball.direction = 90
+        self.ball.speed = 10 * WIDTH_UNIT
+
+        self.assertFalse(self.ball.update())
+        self.assertEqual(self.ball.xpos, self.ball.right_measure_start)
+        self.ball.action()
+        self.assertEqual(self.ball.ball_action, MEASURE_RIGHT)
+        self.assertAlmostEqual(self.ball.tick_left, 0.5)
+
+        self.assertTrue(self.ball.update())
+        self.ball.action()
+        self.assertEqual(self.ball.ball_action, NOTHING)
@@ -20,12 +20,13 @@ Test circuit grid
 
 import unittest
 
+import numpy as np
 import pygame
 
 from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
 from qpong.model import circuit_node_types as node_types
 
-from qpong.controls.circuit_grid import CircuitGrid
+from qpong.controls.circuit_grid import CircuitGrid, RotationGlyphCache
 
 from qpong.utils.parameters import WINDOW_SIZE, WINDOW_HEIGHT, CIRCUIT_DEPTH
 
@@ -191,6 +192,50 @@ class TestCircuitGrid(unittest.TestCase):
             node_types.EMPTY, self.circuit_grid_model.get_node_gate_part(3, 0)
         )
 
+    def test_dirty_rects(self):
+        """
+        Test that cursor moves and edits only mark the tiles they touch
+        """
+
+        grid_rect = self.grid.circuit_grid_background.rect
+        self.assertEqual(self.grid.pop_dirty_rects()[0], grid_rect)
+        self.assertEqual(self.grid.pop_dirty_rects(), [])
+
+        self.grid.move_to_adjacent_node(MOVE_RIGHT)
+        dirty_rects = self.grid.pop_dirty_rects()
+        self.assertEqual(len(dirty_rects), 2)
+        for dirty_rect in dirty_rects:
+            self.assertEqual(dirty_rect.size, self.grid.circuit_grid_cursor.rect.size)
+
+        self.grid.handle_input_x()
+        dirty_rects = self.grid.pop_dirty_rects()
+        self.assertEqual(len(dirty_rects), 1)
+        column_rect = self.grid.gate_tiles[0][1].rect.unionall(
+            [gate_tile.rect for gate_tile in self.grid.gate_tiles[:, 1]]
+        )
+        self.assertTrue(dirty_rects[0].contains(column_rect))
+        self.assertLess(dirty_rects[0].width, grid_rect.width / 2)
+
+    def test_rotation_glyph_cache(self):
+        """
+        Test that rotation glyphs are drawn once per gate and angle step
+        """
+
+        rotation_glyphs = RotationGlyphCache()
+        glyph, _ = rotation_glyphs.get(node_types.Y, np.pi / 8)
+
+        self.assertIs(
+            rotation_glyphs.get(node_types.Y, np.pi / 8 + 2 * np.pi)[0], glyph
+        )
+        self.assertIsNot(rotation_glyphs.get(node_types.Z, np.pi / 8)[0], glyph)
+        self.assertIsNot(rotation_glyphs.get(node_types.Y, np.pi / 4)[0], glyph)
+        self.assertEqual(rotation_glyphs.hits, 1)
+        self.assertEqual(rotation_glyphs.misses, 3)
+
+        rotation_glyphs.warm_up()
+
+        self.assertEqual(rotation_glyphs.misses, 3 * 15)
+
     def test_handle_multi_gate_inputs(self):
         """
         Test handling input placing multi
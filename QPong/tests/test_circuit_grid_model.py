@@ -20,7 +20,14 @@ Test circuit grid model
 
 import unittest
 
-from qpong.model import CircuitGridModel, CircuitGridNode
+import numpy as np
+
+from qpong.model import (
+    CircuitGridModel,
+    CircuitGridNode,
+    SimulationCache,
+    StatevectorSimulator,
+)
 from qpong.model import circuit_node_types as node_types
 
 
@@ -104,3 +111,219 @@ class TestCircuitGridModel(unittest.TestCase):
                     self.model.get_node(wire_num, column_num).node_type,
                     node_types.EMPTY,
                 )
+
+    def test_statevector_matches_simulator(self):
+        """
+        Test cached statevector against a full simulation
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(2, 2, CircuitGridNode(node_types.Y, radians=np.pi / 8))
+
+        np.testing.assert_allclose(
+            self.model.get_statevector(),
+            StatevectorSimulator().statevector(self.model),
+        )
+
+    def test_prefix_states_kept_after_edit(self):
+        """
+        Test that editing a column keeps the states of earlier columns
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X))
+        first_state = self.model.get_column_state(0)
+        self.model.get_statevector()
+
+        self.model.set_node(2, 2, CircuitGridNode(node_types.X))
+
+        self.assertIs(self.model.get_column_state(0).base, first_state.base)
+        self.assertAlmostEqual(self.model.get_probabilities()[0b110], 0.5)
+        self.assertAlmostEqual(self.model.get_probabilities()[0b111], 0.5)
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.EMPTY))
+
+        self.assertAlmostEqual(self.model.get_probabilities()[0b110], 1.0)
+
+        self.model.reset_circuit()
+
+        self.assertAlmostEqual(self.model.get_probabilities()[0], 1.0)
+
+    def test_rotation_rebinds_template(self):
+        """
+        Test that changing the angle of a rotation rebinds the template
+        instead of recompiling its column
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.Y))
+        self.model.get_statevector()
+        template = self.model.get_template()
+        compilations = template.compilations
+
+        for step in range(1, 5):
+            self.model.set_node(
+                1, 1, CircuitGridNode(node_types.Y, radians=step * np.pi / 8)
+            )
+            np.testing.assert_allclose(
+                self.model.get_statevector(),
+                StatevectorSimulator(optimize=False).statevector(self.model),
+                atol=1e-9,
+            )
+
+        self.assertEqual(template.compilations, compilations)
+        self.assertEqual(template.rebinds, 4)
+
+        self.model.set_node(1, 1, CircuitGridNode(node_types.Y, ctrl_a=0))
+
+        self.assertEqual(template.compilations, compilations + 1)
+        self.assertAlmostEqual(self.model.get_probabilities()[0b011], 0.5)
+
+    def test_get_node_returns_copy(self):
+        """
+        Test that nodes only change through set_node
+        """
+
+        self.model.set_node(0, 0, self.node_x)
+        node = self.model.get_node(0, 0)
+        node.radians = np.pi / 8
+
+        self.assertEqual(self.model.get_node(0, 0).radians, 0.0)
+
+        self.model.set_node(0, 0, node)
+
+        self.assertEqual(self.model.get_node(0, 0).radians, np.pi / 8)
+        self.assertEqual(self.model.get_node(1, 0).radians, 0.0)
+
+    def test_copy_and_load_nodes(self):
+        """
+        Test copying and restoring all nodes of the grid
+        """
+
+        self.model.set_node(0, 0, self.node_x)
+        nodes = self.model.copy_nodes()
+
+        self.model.reset_circuit()
+        self.assertEqual(self.model.get_node(0, 0).node_type, node_types.EMPTY)
+
+        self.model.load_nodes(nodes)
+        self.assertEqual(self.model.get_node(0, 0).node_type, node_types.X)
+        self.assertAlmostEqual(self.model.get_probabilities()[1], 1.0)
+
+    def test_control_and_swap_index(self):
+        """
+        Test looking up control and swap parts of gates on other wires
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X, ctrl_a=2))
+        self.model.set_node(1, 0, CircuitGridNode(node_types.TRACE))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.SWAP, swap=1))
+
+        self.assertEqual(self.model.get_node_gate_part(2, 0), node_types.CTRL)
+        self.assertEqual(self.model.get_node_gate_part(1, 0), node_types.TRACE)
+        self.assertEqual(self.model.get_gate_wire_for_control_node(2, 0), 0)
+        self.assertEqual(self.model.get_node_gate_part(1, 1), node_types.SWAP)
+        self.assertEqual(self.model.get_gate_wire_for_control_node(1, 1), -1)
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X, ctrl_a=1))
+
+        self.assertEqual(self.model.get_node_gate_part(2, 0), node_types.EMPTY)
+        self.assertEqual(self.model.get_gate_wire_for_control_node(2, 0), -1)
+
+        self.model.load_nodes(self.model.copy_nodes())
+
+        self.assertEqual(self.model.get_gate_wire_for_control_node(1, 0), 0)
+
+        self.model.reset_circuit()
+
+        self.assertEqual(self.model.get_node_gate_part(1, 1), node_types.EMPTY)
+
+    def test_fingerprint(self):
+        """
+        Test that the fingerprint follows the grid content
+        """
+
+        empty_fingerprint = self.model.fingerprint()
+
+        self.model.set_node(0, 0, self.node_x)
+        x_fingerprint = self.model.fingerprint()
+
+        self.assertNotEqual(empty_fingerprint, x_fingerprint)
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X, radians=np.pi / 8))
+
+        self.assertNotEqual(x_fingerprint, self.model.fingerprint())
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.EMPTY, radians=-0.0))
+
+        self.assertEqual(empty_fingerprint, self.model.fingerprint())
+
+    def test_simulation_cache(self):
+        """
+        Test that toggling a gate back reuses earlier simulation results
+        """
+
+        self.model.get_probabilities()
+        self.model.set_node(0, 0, self.node_x)
+        self.model.get_probabilities()
+
+        stats = self.model.simulation_cache.stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["misses"], 2)
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.EMPTY))
+        self.assertAlmostEqual(self.model.get_probabilities()[0], 1.0)
+
+        self.model.set_node(0, 0, self.node_x)
+        self.assertAlmostEqual(self.model.get_probabilities()[1], 1.0)
+
+        self.model.reset_circuit()
+        self.assertAlmostEqual(self.model.get_probabilities()[0], 1.0)
+
+        self.assertEqual(self.model.simulation_cache.stats()["hits"], 3)
+
+    def test_simulation_cache_eviction(self):
+        """
+        Test that the simulation cache stays within its size
+        """
+
+        model = CircuitGridModel(3, 3, SimulationCache(maxsize=2))
+
+        for wire_num in range(3):
+            model.set_node(wire_num, 0, self.node_x)
+            model.get_probabilities()
+
+        self.assertEqual(len(model.simulation_cache), 2)
+        self.assertEqual(model.simulation_cache.evictions, 1)
+
+    def test_journal_and_observers(self):
+        """
+        Test that only actual mutations are journaled and notified
+        """
+
+        notified = []
+        self.model.subscribe(notified.append)
+
+        self.model.set_node(0, 1, self.node_x)
+        self.model.set_node(0, 1, CircuitGridNode(node_types.X))
+
+        self.assertEqual(self.model.revision, 1)
+        self.assertEqual(len(notified), 1)
+        change = self.model.journal[-1]
+        self.assertEqual((change.wire_num, change.column_num), (0, 1))
+        self.assertEqual(change.old_node, (node_types.EMPTY, 0.0, -1, -1, -1))
+        self.assertEqual(change.new_node, (node_types.X, 0.0, -1, -1, -1))
+
+        self.model.set_node(2, 2, self.node_z)
+        self.model.reset_circuit()
+
+        self.assertEqual(self.model.revision, 3)
+        self.assertEqual(len(notified[-1]), 2)
+
+        self.model.reset_circuit()
+        self.model.unsubscribe(notified.append)
+        self.model.set_node(0, 0, self.node_y)
+
+        self.assertEqual(self.model.revision, 4)
+        self.assertEqual(len(notified), 3)
@@ -0,0 +1,184 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test peephole optimization of circuit grid operations
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_optimizer import optimize_columns, optimize_operations
+from qpong.model.statevector_simulator import (
+    StatevectorSimulator,
+    column_operations,
+    grid_operations,
+)
+
+from tests.helpers import random_grid_model
+
+
+class TestCircuitOptimizer(unittest.TestCase):
+    """
+    Unit tests for the peephole optimization pass
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 6)
+
+    def optimize(self):
+        """
+        Optimize the operations of the test grid
+        """
+
+        return optimize_operations(grid_operations(self.model))
+
+    def test_cancel_inverse_pairs(self):
+        """
+        Test cancelling X.X and S.SDG, including nested pairs
+        """
+
+        # 0 X-H-H-X--
+        # 1 S-SDG----
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.H))
+        self.model.set_node(0, 2, CircuitGridNode(node_types.H))
+        self.model.set_node(0, 3, CircuitGridNode(node_types.X))
+        self.model.set_node(1, 0, CircuitGridNode(node_types.S))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.SDG))
+
+        operations, eliminated = self.optimize()
+
+        self.assertEqual(operations, [])
+        self.assertEqual(eliminated, 6)
+
+    def test_blocked_by_gate_in_between(self):
+        """
+        Test that a gate on a shared wire prevents cancellation
+        """
+
+        # 0 X-|-X--
+        # 1 --X----
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.model.set_node(0, 2, CircuitGridNode(node_types.X))
+
+        operations, eliminated = self.optimize()
+
+        self.assertEqual(len(operations), 3)
+        self.assertEqual(eliminated, 0)
+
+    def test_merge_rotations(self):
+        """
+        Test merging consecutive rotations about the same axis
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X, radians=np.pi / 8))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.X, radians=np.pi / 4))
+        self.model.set_node(1, 0, CircuitGridNode(node_types.Z, radians=np.pi))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.Z, radians=3 * np.pi))
+        self.model.set_node(2, 0, CircuitGridNode(node_types.Y, radians=np.pi))
+        self.model.set_node(2, 1, CircuitGridNode(node_types.Y))
+
+        operations, eliminated = self.optimize()
+
+        self.assertEqual(eliminated, 3)
+        self.assertEqual(len(operations), 3)
+        self.assertAlmostEqual(operations[0].radians, 3 * np.pi / 8)
+
+    def test_same_statevector(self):
+        """
+        Test that the reduced circuits give the same statevector
+        """
+
+        rng = np.random.default_rng(11)
+        optimizing = StatevectorSimulator(optimize=True)
+        reference = StatevectorSimulator(optimize=False)
+
+        for _ in range(50):
+            model = random_grid_model(rng, max_columns=12)
+            np.testing.assert_allclose(
+                optimizing.statevector(model), reference.statevector(model), atol=1e-9
+            )
+
+    def test_optimize_columns(self):
+        """
+        Test that the states between gates combined across columns are not kept
+        """
+
+        # 0 X-H-H-X--
+        # 1 ----Z----
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.H))
+        self.model.set_node(0, 2, CircuitGridNode(node_types.H))
+        self.model.set_node(0, 3, CircuitGridNode(node_types.X))
+        self.model.set_node(1, 2, CircuitGridNode(node_types.Z))
+
+        template = self.model.get_template()
+        optimized, inexact, eliminated = optimize_columns(
+            [template.column_operations(column) for column in range(6)]
+        )
+
+        self.assertEqual(eliminated, 4)
+        self.assertEqual(inexact, {0, 1, 2})
+        self.assertEqual(
+            [len(operations) for operations in optimized], [0, 0, 1, 0, 0, 0]
+        )
+
+    def test_live_statevector(self):
+        """
+        Test that the statevectors of the game path match the unoptimized ones
+        while editing a grid
+        """
+
+        rng = np.random.default_rng(12)
+        reference = StatevectorSimulator(optimize=False)
+        model = random_grid_model(rng, max_columns=12)
+
+        for _ in range(40):
+            # copy a column of a fresh grid, or the previous column so that
+            # gates cancel across columns
+            nodes = model.copy_nodes()
+            column = int(rng.integers(1, model.max_columns))
+            if rng.integers(2):
+                nodes[:, column] = nodes[:, column - 1]
+            else:
+                nodes[:, column] = random_grid_model(rng, max_columns=12).nodes[
+                    :, column
+                ]
+            model.load_nodes(nodes)
+
+            np.testing.assert_allclose(
+                model.get_statevector(), reference.statevector(model), atol=1e-9
+            )
+            column = int(rng.integers(model.max_columns))
+            operations = [
+                operation
+                for column_num in range(column + 1)
+                for operation in column_operations(model, column_num)
+            ]
+            np.testing.assert_allclose(
+                model.get_column_state(column),
+                reference.run(operations, model.max_wires),
+                atol=1e-9,
+            )
@@ -0,0 +1,68 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test swept collision
+"""
+
+import unittest
+
+import pygame
+
+from qpong.utils.collision import AXIS_X, AXIS_Y, crossing_time, sweep_box
+
+
+class TestCollision(unittest.TestCase):
+    """
+    Unit tests for swept collision
+    """
+
+    def test_sweep_box(self):
+        """
+        Test time of impact of a box moving against another
+        """
+
+        target = pygame.Rect(100, 0, 10, 100)
+
+        self.assertEqual(sweep_box((0, 50, 10, 10), (180, 0), target), (0.5, AXIS_X))
+        self.assertEqual(sweep_box((200, 50, 10, 10), (-180, 0), target), (0.5, AXIS_X))
+        self.assertIsNone(sweep_box((0, 50, 10, 10), (80, 0), target))
+        self.assertIsNone(sweep_box((0, 50, 10, 10), (-80, 0), target))
+        self.assertIsNone(sweep_box((0, 150, 10, 10), (180, 0), target))
+        self.assertEqual(sweep_box((100, 120, 10, 10), (0, -40), target), (0.5, AXIS_Y))
+
+    def test_sweep_box_through(self):
+        """
+        Test that a move far beyond the target still hits it
+        """
+
+        target = pygame.Rect(100, 0, 10, 100)
+
+        time, axis = sweep_box((0, 50, 10, 10), (9000, 0), target)
+
+        self.assertEqual(axis, AXIS_X)
+        self.assertAlmostEqual(time * 9000, 90)
+
+    def test_crossing_time(self):
+        """
+        Test time of reaching a boundary
+        """
+
+        self.assertEqual(crossing_time(0, 10, 5), 0.5)
+        self.assertEqual(crossing_time(10, -10, 5), 0.5)
+        self.assertIsNone(crossing_time(0, 10, 20))
+        self.assertIsNone(crossing_time(0, 0, 5))
@@ -0,0 +1,91 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test font registry and rendered text cache
+"""
+
+import unittest
+
+import pygame
+
+from qpong.utils.colors import WHITE, GRAY
+from qpong.utils.font import Font, FontRegistry, TextCache
+
+
+class TestFont(unittest.TestCase):
+    """
+    Unit tests for font registry and rendered text cache
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        pygame.init()
+
+    def test_fonts_shared(self):
+        """
+        Test that font faces are loaded once per name and size
+        """
+
+        first = Font()
+        second = Font()
+
+        self.assertIs(first.score_font, second.score_font)
+        self.assertIs(first.vector_font, first.player_font)
+
+    def test_rendered_text_cached(self):
+        """
+        Test that identical text is rendered once
+        """
+
+        font_registry = FontRegistry(TextCache(maxsize=2))
+        font = font_registry.get("bit5x3.ttf", 20)
+
+        text = font.render("|000>", 1, WHITE)
+
+        self.assertIs(font.render("|000>", True, WHITE), text)
+        self.assertIsNot(font.render("|000>", 1, GRAY), text)
+        self.assertEqual(text.get_height(), font.get_height())
+
+        font.render("|001>", 1, WHITE)
+
+        self.assertIsNot(font.render("|000>", 1, WHITE), text)
+        self.assertEqual(
+            font_registry.text_cache.stats(),
+            {
+                "size": 2,
+                "maxsize": 2,
+                "hits": 1,
+                "misses": 4,
+                "evictions": 2,
+                "hit_rate": 0.2,
+            },
+        )
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test game core and headless runs
+"""
+
+import threading
+import unittest
+
+import pygame
+
+from qpong.utils.ball import Ball
+from qpong.utils.game_core import GameCore
+from qpong.utils.headless import new_match, run_headless
+from qpong.utils.level import Level
+from qpong.utils.scene import Scene
+from qpong.model.simulation_worker import SimulationWorker
+
+from qpong.utils.parameters import QUANTUM_COMPUTER, WIN_SCORE
+
+from tests.helpers import init_display
+
+
+class RecordingSimulator:  # pylint: disable=too-few-public-methods
+    """
+    Simulator recording the circuit grids it is asked to simulate
+    """
+
+    def __init__(self):
+        self.simulated = []
+
+    def probabilities(self, circuit_grid_model):
+        """
+        Record the circuit grid model and simulate it
+        """
+        self.simulated.append(circuit_grid_model)
+        return circuit_grid_model.get_probabilities()
+
+
+class TestGameCore(unittest.TestCase):
+    """
+    Unit tests for game core
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        init_display()
+
+        self.scene = Scene()
+        self.level = Level(rng=0)
+        self.ball = Ball()
+        self.level.setup(self.scene, self.ball)
+        self.core = GameCore(self.scene, self.level, self.ball)
+
+    def test_measurement(self):
+        """
+        Test that the quantum paddle is measured when the ball
+        enters the measurement zone
+        """
+
+        self.level.circuit_grid.handle_input_x()
+        self.ball.xpos = self.ball.right_measure_start - 1
+        self.ball.ypos = 100
+        self.ball.direction = 90
+
+        self.core.tick()
+
+        self.assertEqual(self.core.measure_time, self.core.timestep.time)
+        self.assertEqual(
+            self.level.right_paddle.rect.y, self.level.statevector_grid.block_size
+        )
+
+    def test_measurement_waits_for_busy_worker(self):
+        """
+        Test that measuring while the worker still simulates the last edit
+        takes the outcome from the worker instead of simulating inline
+        """
+
+        worker = SimulationWorker()
+        self.core = GameCore(self.scene, self.level, self.ball, worker)
+        # keep the worker busy until the ball is measured
+        release = threading.Event()
+        worker.executor.submit(release.wait)
+        threading.Timer(0.2, release.set).start()
+
+        self.level.circuit_grid.handle_input_x()
+        worker.submit(self.level.circuit_grid_model)
+        inline = RecordingSimulator()
+        self.level.statevector_grid.simulator = inline
+
+        self.ball.xpos = self.ball.right_measure_start - 1
+        self.ball.ypos = 100
+        self.ball.direction = 90
+        self.core.tick()
+        worker.shutdown()
+
+        self.assertEqual(inline.simulated, [])
+        self.assertEqual(worker.latest.revision, self.level.circuit_grid_model.revision)
+        self.assertEqual(self.core.outcomes, [0b001])
+        self.assertEqual(
+            self.level.right_paddle.rect.y, self.level.statevector_grid.block_size
+        )
+
+    def test_winner(self):
+        """
+        Test winner of the match
+        """
+
+        self.assertIsNone(self.core.winner())
+
+        for _ in range(WIN_SCORE):
+            self.ball.score.update(QUANTUM_COMPUTER)
+
+        self.assertEqual(self.core.winner(), QUANTUM_COMPUTER)
+
+    def test_headless_run(self):
+        """
+        Test that seeded headless runs are reproducible
+        """
+
+        result = run_headless(rallies=20, seed=7)
+        again = run_headless(rallies=20, seed=7)
+
+        self.assertEqual(result.rallies, 20)
+        self.assertEqual(result.classical_points + result.quantum_points, 20)
+        self.assertEqual(result[:-1], again[:-1])
+
+    def test_fast_forward(self):
+        """
+        Test that fast forwarding plays the same match as ticking
+        """
+
+        ticking = new_match(seed=3)
+        while ticking.timestep.ticks < 5000:
+            ticking.tick()
+
+        skipping = new_match(seed=3)
+        while skipping.timestep.ticks < 5000:
+            skipping.fast_forward(5000 - skipping.timestep.ticks)
+
+        self.assertEqual(skipping.rally_lengths, ticking.rally_lengths)
+        self.assertEqual(skipping.outcomes, ticking.outcomes)
+        self.assertEqual(
+            (skipping.ball.xpos, skipping.ball.ypos),
+            (ticking.ball.xpos, ticking.ball.ypos),
+        )
+        self.assertEqual(
+            skipping.level.left_paddle.rect.y, ticking.level.left_paddle.rect.y
+        )
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
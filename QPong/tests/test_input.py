@@ -29,6 +29,7 @@ from qpong.utils.ball import Ball
 from qpong.utils.input import Input
 
 from qpong.model import circuit_node_types as node_types
+from qpong.model.simulation_worker import SimulationWorker
 
 from qpong.utils.parameters import WINDOW_SIZE
 
@@ -289,3 +290,20 @@ class TestLevel(unittest.TestCase):
         """
 
         pygame.quit()
+
+    def test_simulation_worker_updates_paddle(self):
+        """
+        Test that edits are simulated by the worker and picked up by polling
+        """
+
+        worker = SimulationWorker()
+        self.input = Input(worker)
+
+        self.inject_event(pygame.KEYDOWN, key=pygame.K_x)
+        # let the queued simulation finish
+        worker.executor.shutdown(wait=True)
+
+        self.assertTrue(self.input.poll_simulation(self.level, self.scene))
+        self.assertEqual(worker.latest.revision, self.level.circuit_grid_model.revision)
+        self.assertAlmostEqual(worker.latest.probabilities[0b001], 1.0)
+        self.assertFalse(self.input.poll_simulation(self.level, self.scene))
@@ -26,7 +26,7 @@ from qpong.utils.level import Level
 from qpong.utils.scene import Scene
 from qpong.utils.ball import Ball
 
-from qpong.utils.parameters import WINDOW_SIZE
+from tests.helpers import init_display
 
 
 class Testlevel(unittest.TestCase):
@@ -39,10 +39,7 @@ class Testlevel(unittest.TestCase):
         Set up
         """
 
-        pygame.init()
-
-        flags = pygame.DOUBLEBUF | pygame.HWSURFACE
-        _ = pygame.display.set_mode(WINDOW_SIZE, flags)
+        init_display()
 
         self.scene = Scene()
         self.level = Level()
@@ -55,7 +52,6 @@ class Testlevel(unittest.TestCase):
 
         self.assertEqual(self.level.level, 3)
         self.assertEqual(self.level.win, False)
-        self.assertEqual(self.level.circuit is None, True)
         self.assertEqual(self.level.circuit_grid is None, True)
         self.assertEqual(self.level.circuit_grid_model is None, True)
         self.assertEqual(self.level.statevector_grid is None, True)
@@ -69,12 +65,59 @@ class Testlevel(unittest.TestCase):
         self.level.setup(self.scene, self.ball)
 
         self.assertEqual(self.scene.qubit_num, 3)
-        self.assertEqual(self.level.circuit is None, False)
         self.assertEqual(self.level.circuit_grid is None, False)
         self.assertEqual(self.level.circuit_grid_model is None, False)
         self.assertEqual(self.level.statevector_grid is None, False)
         self.assertEqual(self.level.right_statevector is None, False)
 
+    def test_premeasurement(self):
+        """
+        Test that a measurement drawn ahead of time is used only
+        while the circuit grid is unchanged
+        """
+
+        self.level.setup(self.scene, self.ball)
+        statevector_grid = self.level.statevector_grid
+        circuit_grid_model = self.level.circuit_grid_model
+
+        statevector_grid.premeasure(circuit_grid_model)
+        statevector_grid.premeasurement = (circuit_grid_model.revision, 5)
+
+        self.assertEqual(statevector_grid.measure(circuit_grid_model), 5)
+        self.assertIsNone(statevector_grid.premeasurement)
+
+        statevector_grid.premeasure(circuit_grid_model)
+        statevector_grid.premeasurement = (circuit_grid_model.revision, 5)
+        self.level.circuit_grid.handle_input_x()
+
+        self.assertEqual(statevector_grid.measure(circuit_grid_model), 1)
+
+    def test_statevector_grid_refresh(self):
+        """
+        Test that the statevector grid keeps its image and only
+        repaints the paddle cells that changed
+        """
+
+        self.level.setup(self.scene, self.ball)
+        statevector_grid = self.level.statevector_grid
+        circuit_grid_model = self.level.circuit_grid_model
+        image = statevector_grid.image
+        label_layer = statevector_grid.label_layer(self.scene.qubit_num)
+        block_size = statevector_grid.block_size
+
+        self.assertEqual(image.get_at((0, 0))[:3], (255, 255, 255))
+        self.assertEqual(image.get_at((0, block_size))[:3], (0, 0, 0))
+
+        self.level.circuit_grid.handle_input_x()
+        statevector_grid.paddle_before_measurement(
+            circuit_grid_model, self.scene.qubit_num
+        )
+
+        self.assertIs(statevector_grid.image, image)
+        self.assertIs(statevector_grid.label_layer(self.scene.qubit_num), label_layer)
+        self.assertEqual(image.get_at((0, 0))[:3], (0, 0, 0))
+        self.assertEqual(image.get_at((0, block_size))[:3], (255, 255, 255))
+
     def tearDown(self):
         """
         Tear down
@@ -0,0 +1,104 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test match simulator
+"""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from qpong.utils.match_simulator import (
+    MatchSetting,
+    play_match,
+    settings_grid,
+    simulate,
+    summarize,
+    write_report,
+)
+from qpong.utils.parameters import WIN_SCORE
+
+
+class TestMatchSimulator(unittest.TestCase):
+    """
+    Unit tests for match simulator
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.setting = MatchSetting("expert", 300, 4, "tracking")
+
+    def test_play_match(self):
+        """
+        Test that a seeded match is played to WIN_SCORE reproducibly
+        """
+
+        result = play_match(self.setting, 5)
+
+        self.assertIsNotNone(result.winner)
+        self.assertGreaterEqual(len(result.rally_lengths), WIN_SCORE)
+        self.assertEqual(result.ticks, sum(result.rally_lengths))
+        self.assertEqual(play_match(self.setting, 5), result)
+
+    def test_summarize(self):
+        """
+        Test aggregation of match results
+        """
+
+        results = [play_match(self.setting, seed) for seed in range(2)]
+        row = summarize(self.setting, results, 8)
+
+        self.assertEqual(row["matches"], 2)
+        self.assertAlmostEqual(row["quantum_win_rate"] + row["classical_win_rate"], 1)
+        self.assertAlmostEqual(sum(row["outcome_distribution"]), 1, places=3)
+
+    def test_simulate_deterministic(self):
+        """
+        Test that the report does not depend on the number of processes
+        """
+
+        settings = settings_grid(["normal"], strategies=["idle", "random"])
+
+        rows = simulate(settings, 2, seed=3, processes=2)
+
+        self.assertEqual([row["strategy"] for row in rows], ["idle", "random"])
+        self.assertEqual(simulate(settings, 2, seed=3, processes=1), rows)
+
+    def test_write_report(self):
+        """
+        Test CSV and JSON reports
+        """
+
+        rows = [summarize(self.setting, [play_match(self.setting, 1)], 8)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "report.json")
+            write_report(rows, json_path)
+            with open(json_path, encoding="utf-8") as report_file:
+                self.assertEqual(json.load(report_file), rows)
+
+            csv_path = os.path.join(directory, "report.csv")
+            write_report(rows, csv_path)
+            with open(csv_path, encoding="utf-8", newline="") as report_file:
+                csv_rows = list(csv.DictReader(report_file))
+            self.assertEqual(csv_rows[0]["strategy"], "tracking")
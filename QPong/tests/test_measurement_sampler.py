@@ -0,0 +1,87 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test measurement sampler
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model.measurement_sampler import MeasurementSampler
+
+
+class TestMeasurementSampler(unittest.TestCase):
+    """
+    Unit tests for measurement sampler
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.probabilities = np.array([0.5, 0.0, 0.25, 0.25])
+
+    def test_seeded_samples_are_reproducible(self):
+        """
+        Test that samplers with the same seed draw the same outcomes
+        """
+
+        first = MeasurementSampler(42).sample(self.probabilities, 50)
+        second = MeasurementSampler(np.random.default_rng(42)).sample(
+            self.probabilities, 50
+        )
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_single_shot(self):
+        """
+        Test that a single shot is a plain integer
+        """
+
+        outcome = MeasurementSampler(1).sample(np.array([0.0, 0.0, 1.0, 0.0]))
+
+        self.assertIsInstance(outcome, int)
+        self.assertEqual(outcome, 2)
+
+    def test_counts_follow_probabilities(self):
+        """
+        Test that outcome frequencies follow the probabilities and
+        that states of zero probability are never drawn
+        """
+
+        counts = MeasurementSampler(3).counts(self.probabilities, 20000)
+
+        self.assertEqual(counts[1], 0)
+        np.testing.assert_allclose(counts / 20000, self.probabilities, atol=0.02)
+
+    def test_cdf_reused_for_same_probabilities(self):
+        """
+        Test that the cumulative distribution is built once per vector
+        """
+
+        sampler = MeasurementSampler(5)
+        cdf = sampler.cdf(self.probabilities)
+
+        self.assertIs(sampler.cdf(self.probabilities), cdf)
+        self.assertIsNot(sampler.cdf(self.probabilities.copy()), cdf)
+
+
+if __name__ == "__main__":
+    unittest.main()
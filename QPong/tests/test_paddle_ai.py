@@ -0,0 +1,81 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test classical paddle
+"""
+
+import unittest
+
+import pygame
+
+from qpong.utils.ball import Ball
+from qpong.utils.paddle_ai import ClassicalPaddleAI
+from qpong.utils.parameters import WIDTH_UNIT
+
+
+class TestClassicalPaddleAI(unittest.TestCase):
+    """
+    Unit tests for classical paddle
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.ball = Ball()
+        self.paddle = pygame.sprite.Sprite()
+        self.paddle.rect = pygame.Rect(9 * WIDTH_UNIT, 0, WIDTH_UNIT, 60)
+        self.paddle_ai = ClassicalPaddleAI(
+            self.paddle, self.ball, reaction_time=100, error=0, speed=1
+        )
+
+    def test_predicts_on_course_change_only(self):
+        """
+        Test that the crossing is predicted on bounces and resets only
+        """
+
+        predictions = self.paddle_ai.predictions
+        self.ball.update()
+        self.assertEqual(self.paddle_ai.predictions, predictions)
+
+        self.ball.bounce_edge()
+        self.ball.reset()
+        self.assertEqual(self.paddle_ai.predictions, predictions + 2)
+
+    def test_speed_limited_move(self):
+        """
+        Test that the paddle reacts late and moves at a limited speed
+        """
+
+        self.ball.xpos = 600
+        self.ball.ypos = 400
+        self.ball.direction = 270
+        self.paddle_ai.on_course_change(self.ball)
+        target = self.paddle_ai.target
+
+        self.paddle_ai.update(0)
+        self.assertEqual(self.paddle.rect.y, 0)
+
+        self.paddle_ai.update(100)
+        self.assertEqual(self.paddle.rect.y, WIDTH_UNIT)
+
+        for time in range(101, 200):
+            self.paddle_ai.update(time)
+        self.assertEqual(self.paddle.rect.y, round(target))
+        self.assertAlmostEqual(target, 400 + self.ball.height / 2 - 30)
@@ -0,0 +1,104 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test dirty rectangle renderer
+"""
+
+import unittest
+
+import pygame
+
+from qpong.utils.ball import Ball
+from qpong.utils.colors import BLACK, WHITE
+from qpong.utils.renderer import DirtyRectRenderer
+
+from qpong.utils.parameters import WINDOW_SIZE
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    """
+    Unit tests for dirty rectangle renderer
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        pygame.init()
+
+        flags = pygame.DOUBLEBUF | pygame.HWSURFACE
+        self.screen = pygame.display.set_mode(WINDOW_SIZE, flags)
+
+        self.background_draws = 0
+        self.ball = Ball()
+        self.renderer = DirtyRectRenderer(self.screen, self.draw_background)
+        self.renderer.add(self.ball)
+
+    def draw_background(self, surface):
+        """
+        Count background draws
+        """
+
+        self.background_draws += 1
+        surface.fill(BLACK)
+
+    def test_only_moving_sprites_updated(self):
+        """
+        Test that frames without invalidated areas only
+        update the moving sprites
+        """
+
+        self.renderer.render()
+
+        self.assertEqual(self.background_draws, 1)
+        self.assertEqual(self.renderer.updated_rects, 0)
+
+        self.ball.xpos += 10
+        self.ball.update()
+        self.renderer.render()
+
+        self.assertEqual(self.background_draws, 1)
+        self.assertLessEqual(self.renderer.updated_rects, 2)
+        self.assertEqual(self.screen.get_at(self.ball.rect.center), WHITE)
+
+    def test_invalidated_area_redrawn(self):
+        """
+        Test that an invalidated area is restored from the background
+        """
+
+        self.renderer.render()
+        pygame.draw.rect(self.screen, WHITE, (100, 100, 10, 10))
+
+        self.renderer.invalidate(pygame.Rect(100, 100, 10, 10))
+        self.renderer.render()
+
+        self.assertEqual(self.background_draws, 2)
+        self.assertEqual(self.renderer.updated_rects, 2)
+        self.assertEqual(self.screen.get_at((105, 105)), BLACK)
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
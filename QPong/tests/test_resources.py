@@ -22,7 +22,13 @@ import unittest
 
 import pygame
 
-from qpong.utils.resources import load_font, load_sound, load_image
+from qpong.utils import parameters
+from qpong.utils.resources import (
+    ImageCache,
+    load_font,
+    load_sound,
+    load_image,
+)
 
 from qpong.utils.parameters import WINDOW_SIZE
 
@@ -75,6 +81,48 @@ class TestResources(unittest.TestCase):
         self.assertEqual(self.image1 is not None, True)
         self.assertEqual(self.image2 is not None, True)
 
+    def test_image_cache(self):
+        """
+        Test that images are loaded once per name, scale and colorkey
+        """
+
+        image_cache = ImageCache()
+        image, rect = image_cache.get("gate_images/h_gate.png", -1)
+
+        self.assertIs(image_cache.get("gate_images/h_gate.png", -1)[0], image)
+        self.assertIsNot(image_cache.get("gate_images/h_gate.png")[0], image)
+        self.assertEqual(rect.size, load_image("gate_images/h_gate.png", -1)[1].size)
+        self.assertEqual(image_cache.hits, 1)
+        self.assertEqual(image_cache.misses, 2)
+
+        width_unit = parameters.WIDTH_UNIT
+        try:
+            parameters.WIDTH_UNIT = width_unit + 1
+            self.assertIsNot(image_cache.get("gate_images/h_gate.png", -1)[0], image)
+        finally:
+            parameters.WIDTH_UNIT = width_unit
+
+    def test_image_atlas(self):
+        """
+        Test packing cached images into one atlas surface
+        """
+
+        image_cache = ImageCache()
+        image_cache.warm_up()
+        image, _ = image_cache.get("gate_images/x_gate.png", -1)
+        pixels = pygame.image.tostring(image, "RGB")
+
+        image_cache.build_atlas()
+        atlas_image, _ = image_cache.get("gate_images/x_gate.png", -1)
+
+        self.assertIs(atlas_image.get_parent(), image_cache.atlas)
+        self.assertEqual(pygame.image.tostring(atlas_image, "RGB"), pixels)
+        self.assertEqual(atlas_image.get_colorkey(), image.get_colorkey())
+        self.assertEqual(
+            image_cache.memory_report()["total_bytes"],
+            image_cache.memory_report()["atlas_bytes"],
+        )
+
     def tearDown(self):
         """
         Tear down
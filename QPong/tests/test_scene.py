@@ -92,6 +92,40 @@ class TestScene(unittest.TestCase):
         self.scene.start(self.screen, self.ball)
         self.assertEqual(self.ball.initial_speed_factor, EXPERT)
 
+    def test_background_composed_once(self):
+        """
+        Test that the static layer is composed once and
+        score digits are only rendered again on a point
+        """
+
+        self.level.setup(self.scene, self.ball)
+
+        self.scene.draw_background(self.screen, self.ball, self.level.circuit_grid)
+        background = self.scene._background  # pylint: disable=protected-access
+        self.scene.draw_background(self.screen, self.ball, self.level.circuit_grid)
+
+        self.assertIs(
+            self.scene._background, background  # pylint: disable=protected-access
+        )
+
+        self.scene.score_digits(self.screen, self.ball)
+        digits = dict(self.scene._score_digits)  # pylint: disable=protected-access
+        self.scene.score_digits(self.screen, self.ball)
+
+        self.assertEqual(
+            self.scene._score_digits, digits  # pylint: disable=protected-access
+        )
+
+        self.ball.score.update(1)
+        self.scene.score_digits(self.screen, self.ball)
+
+        self.assertIs(
+            self.scene._score_digits[0], digits[0]  # pylint: disable=protected-access
+        )
+        self.assertEqual(
+            self.scene._score_digits[1][0], 1  # pylint: disable=protected-access
+        )
+
     def tearDown(self):
         """
         Tear down
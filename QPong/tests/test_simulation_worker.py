@@ -0,0 +1,126 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test background simulation worker
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model.simulation_worker import SimulationWorker
+
+
+class TestSimulationWorker(unittest.TestCase):
+    """
+    Unit tests for background simulation worker
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.model = CircuitGridModel(3, 4)
+        self.worker = SimulationWorker()
+
+    def tearDown(self):
+        """
+        Tear down
+        """
+
+        self.worker.shutdown()
+
+    def test_result_matches_model(self):
+        """
+        Test that the worker simulates a snapshot of the grid
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.worker.submit(self.model)
+
+        result = self.worker.wait()
+
+        self.assertEqual(result.revision, self.model.revision)
+        self.assertEqual(result.fingerprint, self.model.fingerprint())
+        np.testing.assert_allclose(
+            result.probabilities, self.model.get_probabilities(), atol=1e-9
+        )
+        self.assertIsNone(self.worker.poll())
+
+    def test_newest_revision_wins(self):
+        """
+        Test that results superseded by a newer edit are not published
+        """
+
+        for column_num in range(4):
+            self.model.set_node(0, column_num, CircuitGridNode(node_types.X))
+            self.worker.submit(self.model)
+        self.worker.submit(self.model)
+
+        result = self.worker.wait()
+
+        self.assertEqual(result.revision, self.model.revision)
+        self.assertAlmostEqual(result.probabilities[0b000], 1.0)
+        self.assertIs(self.worker.latest, result)
+
+    def test_cached_grid_published_at_once(self):
+        """
+        Test that toggling a gate back is served from the simulation cache
+        without queueing a job
+        """
+
+        self.worker.submit(self.model)
+        self.worker.wait()
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.worker.submit(self.model)
+        self.worker.wait()
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.EMPTY))
+        result = self.worker.submit(self.model)
+
+        self.assertFalse(self.worker.busy())
+        self.assertIs(self.worker.latest, result)
+        self.assertEqual(result.revision, self.model.revision)
+        self.assertAlmostEqual(result.probabilities[0b000], 1.0)
+        self.assertIsNone(self.worker.poll())
+
+    def test_stale_result_cached(self):
+        """
+        Test that a result superseded by a newer edit is still stored
+        in the simulation cache for its grid
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        fingerprint = self.model.fingerprint()
+        self.worker.submit(self.model)
+        self.worker.executor.submit(lambda: None).result()
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X))
+        self.worker.submit(self.model)
+        self.worker.wait()
+
+        statevector, probabilities = self.model.simulation_cache.get(fingerprint)
+        self.assertAlmostEqual(probabilities[0b000], 0.5)
+        self.assertAlmostEqual(abs(statevector[0b001]) ** 2, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
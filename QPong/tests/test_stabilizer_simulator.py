@@ -0,0 +1,136 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test stabilizer tableau simulator
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model.stabilizer_simulator import (
+    StabilizerSimulator,
+    is_clifford,
+    sample_circuit_grid,
+)
+from qpong.model.measurement_sampler import MeasurementSampler
+from qpong.model.statevector_simulator import StatevectorSimulator, grid_operations
+
+from tests.helpers import random_clifford_grid_model
+
+
+class TestStabilizerSimulator(unittest.TestCase):
+    """
+    Unit tests for stabilizer tableau simulator
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.simulator = StabilizerSimulator()
+        self.rng = np.random.default_rng(7)
+        self.sampler = MeasurementSampler(self.rng)
+
+    def test_is_clifford(self):
+        """
+        Test that T gates, rotations and Toffoli gates are not Clifford
+        """
+        model = CircuitGridModel(3, 3)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        self.assertTrue(is_clifford(grid_operations(model)))
+
+        model.set_node(2, 2, CircuitGridNode(node_types.T))
+        self.assertFalse(is_clifford(grid_operations(model)))
+
+        model.set_node(2, 2, CircuitGridNode(node_types.Y, radians=np.pi / 2))
+        self.assertFalse(is_clifford(grid_operations(model)))
+
+        model.set_node(2, 2, CircuitGridNode(node_types.X, ctrl_a=0, ctrl_b=1))
+        self.assertFalse(is_clifford(grid_operations(model)))
+
+    def test_outcomes_match_statevector(self):
+        """
+        Test that sampled outcomes cover exactly the basis states
+        with nonzero probability
+        """
+        for _ in range(20):
+            model = random_clifford_grid_model(self.rng)
+            probabilities = StatevectorSimulator().probabilities(model)
+            expected = set(np.flatnonzero(probabilities > 1e-9))
+
+            outcomes = self.simulator.sample(
+                grid_operations(model), model.max_wires, shots=200, rng=self.rng
+            )
+            self.assertEqual(set(outcomes), expected)
+
+    def test_ghz_state_on_many_wires(self):
+        """
+        Test sampling a GHZ state beyond the reach of a statevector
+        """
+        max_wires = 100
+        model = CircuitGridModel(max_wires, max_wires)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        for wire_num in range(1, max_wires):
+            model.set_node(
+                wire_num, wire_num, CircuitGridNode(node_types.X, ctrl_a=wire_num - 1)
+            )
+
+        outcomes = sample_circuit_grid(model, shots=20, sampler=self.sampler)
+        self.assertEqual(set(outcomes) - {0, 2**max_wires - 1}, set())
+        self.assertEqual(len(set(outcomes)), 2)
+
+    def test_control_wire_beyond_int8(self):
+        """
+        Test a grid with controls on wires numbered above 127
+        """
+        max_wires = 200
+        model = CircuitGridModel(max_wires, 4)
+        model.set_node(0, 0, CircuitGridNode(node_types.X))
+        model.set_node(150, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+        model.set_node(199, 2, CircuitGridNode(node_types.X, ctrl_a=150))
+        model.set_node(198, 3, CircuitGridNode(node_types.SWAP, swap=199))
+
+        self.assertEqual(model.get_node(150, 1).ctrl_a, 0)
+        self.assertEqual(model.get_gate_wire_for_control_node(150, 2), 199)
+
+        expected = (1 << 0) | (1 << 150) | (1 << 198)
+        self.assertEqual(
+            sample_circuit_grid(model, shots=3, sampler=self.sampler), [expected] * 3
+        )
+        self.assertEqual(sample_circuit_grid(model, sampler=self.sampler), expected)
+
+    def test_small_grid_sampled_from_probabilities(self):
+        """
+        Test that small grids are sampled from the dense probabilities
+        """
+        model = CircuitGridModel(3, 2)
+        model.set_node(0, 0, CircuitGridNode(node_types.X))
+        model.set_node(2, 1, CircuitGridNode(node_types.T))
+
+        self.assertEqual(
+            sample_circuit_grid(model, shots=5, sampler=self.sampler), [1] * 5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
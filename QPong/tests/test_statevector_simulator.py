@@ -0,0 +1,125 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test NumPy statevector simulator
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model import CircuitGridModel, CircuitGridNode
+from qpong.model import circuit_node_types as node_types
+from qpong.model.statevector_simulator import StatevectorSimulator, QiskitSimulator
+
+from tests.helpers import random_grid_model
+
+
+class TestStatevectorSimulator(unittest.TestCase):
+    """
+    Unit tests for NumPy statevector simulator
+    """
+
+    def setUp(self):
+        """
+        Set up
+        """
+
+        self.simulator = StatevectorSimulator()
+        self.model = CircuitGridModel(3, 4)
+
+    def test_empty_circuit(self):
+        """
+        Test simulating an empty circuit grid
+        """
+
+        probabilities = self.simulator.probabilities(self.model)
+
+        self.assertEqual(len(probabilities), 8)
+        self.assertAlmostEqual(probabilities[0], 1.0)
+
+    def test_basis_state_ordering(self):
+        """
+        Test that wire 0 is the least significant bit of a basis state
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.set_node(2, 1, CircuitGridNode(node_types.X))
+
+        probabilities = self.simulator.probabilities(self.model)
+
+        self.assertAlmostEqual(probabilities[0b101], 1.0)
+
+    def test_bell_state(self):
+        """
+        Test H followed by a controlled X
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.model.set_node(1, 1, CircuitGridNode(node_types.X, ctrl_a=0))
+
+        probabilities = self.simulator.probabilities(self.model)
+
+        self.assertAlmostEqual(probabilities[0b000], 0.5)
+        self.assertAlmostEqual(probabilities[0b011], 0.5)
+
+    def test_swap(self):
+        """
+        Test swapping two wires
+        """
+
+        self.model.set_node(0, 0, CircuitGridNode(node_types.X))
+        self.model.set_node(0, 1, CircuitGridNode(node_types.SWAP, swap=2))
+
+        probabilities = self.simulator.probabilities(self.model)
+
+        self.assertAlmostEqual(probabilities[0b100], 1.0)
+
+    def test_matches_qiskit(self):
+        """
+        Test that random circuit grids give the same statevector as qiskit
+        """
+
+        rng = np.random.default_rng(7)
+        reference = QiskitSimulator()
+
+        for _ in range(20):
+            model = random_grid_model(rng)
+            np.testing.assert_allclose(
+                self.simulator.statevector(model),
+                reference.statevector(model),
+                atol=1e-9,
+            )
+
+    def test_batch_matches_single_grids(self):
+        """
+        Test that a batch of grids, some sharing columns, gives the same
+        probabilities as simulating each grid on its own
+        """
+
+        rng = np.random.default_rng(11)
+        models = [random_grid_model(rng) for _ in range(12)]
+        models.extend(models[:4])
+        nodes = np.stack([model.copy_nodes() for model in models])
+
+        probabilities = self.simulator.batch_probabilities(nodes)
+
+        self.assertEqual(probabilities.shape, (len(models), 2**3))
+        for model, row in zip(models, probabilities):
+            np.testing.assert_allclose(
+                row, self.simulator.probabilities(model), atol=1e-9
+            )
@@ -0,0 +1,83 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test fixed timestep
+"""
+
+import unittest
+
+from qpong.utils.timestep import FixedTimestep
+
+
+class TestFixedTimestep(unittest.TestCase):
+    """
+    Unit tests for fixed timestep
+    """
+
+    def test_ticks_independent_of_frame_rate(self):
+        """
+        Test that the same time gives the same ticks at any frame rate
+        """
+
+        fast = FixedTimestep(tick_rate=60)
+        slow = FixedTimestep(tick_rate=60)
+
+        fast_ticks = sum(fast.advance(1 / 120) for _ in range(240))
+        slow_ticks = sum(slow.advance(1 / 20) for _ in range(40))
+
+        self.assertEqual(fast_ticks, slow_ticks)
+        self.assertAlmostEqual(fast_ticks, 120, delta=1)
+
+        for _ in range(fast_ticks):
+            fast.step()
+        self.assertEqual(fast.time, fast_ticks * 1000 // 60)
+
+    def test_alpha(self):
+        """
+        Test the fraction of a tick left for interpolation
+        """
+
+        timestep = FixedTimestep(tick_rate=10)
+
+        self.assertEqual(timestep.advance(0.25), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+
+        timestep.reset()
+        self.assertEqual(timestep.alpha, 0)
+
+    def test_ticks_until(self):
+        """
+        Test counting the ticks before a physics time is passed
+        """
+
+        timestep = FixedTimestep(tick_rate=60)
+        timestep.step(3)
+
+        # ticks 4 to 30 end at 66 to 500 ms
+        self.assertEqual(timestep.ticks_until(500), 27)
+        self.assertEqual(timestep.ticks_until(499), 26)
+        self.assertEqual(timestep.ticks_until(10), 0)
+
+    def test_max_frame_time(self):
+        """
+        Test that a stalled frame only catches up a bounded number of ticks
+        """
+
+        timestep = FixedTimestep(tick_rate=60, max_frame_time=0.25)
+
+        self.assertEqual(timestep.advance(5), 15)
@@ -0,0 +1,83 @@
+#
+# Copyright 2022 the original author or authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""
+Test trajectory prediction
+"""
+
+import math
+import unittest
+
+from qpong.utils.ball import Ball
+from qpong.utils.trajectory import fold, predict_crossing
+
+
+class TestTrajectory(unittest.TestCase):
+    """
+    Unit tests for trajectory prediction
+    """
+
+    def test_fold(self):
+        """
+        Test reflection of positions between two mirrors
+        """
+
+        self.assertEqual(fold(5, 0, 10), 5)
+        self.assertEqual(fold(12, 0, 10), 8)
+        self.assertEqual(fold(-3, 0, 10), 3)
+        self.assertEqual(fold(25, 0, 10), 5)
+
+    def test_predict_crossing_matches_ball(self):
+        """
+        Test that the prediction matches the ball moved tick by tick
+        """
+
+        ball = Ball()
+        ball.xpos = 900
+        ball.ypos = 200
+        ball.direction = 200
+        ball.speed = 7
+        target_x = 120
+
+        crossing = predict_crossing(
+            ball.xpos,
+            ball.ypos,
+            ball.direction,
+            target_x,
+            ball.top_edge,
+            ball.bottom_edge - ball.height,
+        )
+
+        step_x = abs(math.sin(math.radians(ball.direction)))
+        while ball.xpos - ball.speed * step_x > target_x:
+            while not ball.update():
+                pass
+        # last partial tick up to the line
+        ball.speed = (ball.xpos - target_x) / step_x
+        while not ball.update():
+            pass
+
+        self.assertAlmostEqual(ball.xpos, target_x, places=3)
+        self.assertAlmostEqual(ball.ypos, crossing, places=3)
+
+    def test_moving_away(self):
+        """
+        Test that no crossing is predicted for a ball moving away
+        """
+
+        self.assertIsNone(predict_crossing(500, 100, 60, 120, 0, 500))
+        self.assertIsNone(predict_crossing(500, 100, 180, 120, 0, 500))